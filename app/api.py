@@ -0,0 +1,107 @@
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.datastructures import QueryParams
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from app.api_auth import is_authorized
+from app.data import jobs
+from app.data.cube import CUBE_MEASURES
+from app.data.export import EXPORT_PATH, iter_csv, iter_gzip
+from app.data.filters import FilterSignature, filter_signature, matching_rows
+from app.data.store import SUPERSTORE_DATASET, dataset_store
+from app.executor import ExecutorBusy
+from app.metrics import metrics
+from app.settings import METRICS_PATH
+from app.state import aggregation_executor
+
+HEATMAP_PATH = "/heatmap"
+UNAUTHORIZED = "Log in to the dashboard, or send the API token, to read this data."
+
+
+def _query_signature(params: QueryParams) -> FilterSignature:
+    return filter_signature(
+        {"start": params.get("start", ""), "end": params.get("end", "")},
+        params.getlist("category"),
+        params.getlist("region"),
+    )
+
+
+async def export_orders(request: Request):
+    """Streams the orders matching the filters in the query string as CSV."""
+    if not is_authorized(request):
+        return PlainTextResponse(UNAUTHORIZED, status_code=401)
+    dataset = dataset_store.get(SUPERSTORE_DATASET)
+    if dataset is None:
+        return PlainTextResponse("The data is not loaded yet.", status_code=503)
+    params = request.query_params
+    # Selecting millions of rows blocks, and one-off exports are not worth caching.
+    rows = await run_in_threadpool(matching_rows, dataset, _query_signature(params))
+    chunks = iter_csv(rows)
+    filename = "orders.csv"
+    media_type = "text/csv"
+    if params.get("gzip") == "1":
+        chunks = iter_gzip(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+async def export_heatmap(request: Request):
+    """Serves the heatmap of a measure over two dimensions, for the filters given.
+
+    ``rows`` and ``columns`` name the dimensions (e.g. State and Sub-Category)
+    and ``measure`` is Sales, Profit or Quantity.
+    """
+    if not is_authorized(request):
+        return PlainTextResponse(UNAUTHORIZED, status_code=401)
+    dataset = dataset_store.get(SUPERSTORE_DATASET)
+    if dataset is None:
+        return PlainTextResponse("The data is not loaded yet.", status_code=503)
+    params = request.query_params
+    rows = params.get("rows", "Region")
+    columns = params.get("columns", "Category")
+    measure = params.get("measure", "Sales")
+    dimensions = jobs.heatmap_dimensions(dataset)
+    if rows not in dimensions or columns not in dimensions or rows == columns:
+        return PlainTextResponse(
+            f"rows and columns must be two of: {', '.join(dimensions)}",
+            status_code=400,
+        )
+    if measure not in CUBE_MEASURES:
+        return PlainTextResponse(
+            f"measure must be one of: {', '.join(CUBE_MEASURES)}", status_code=400
+        )
+    try:
+        heatmap = await aggregation_executor.run(
+            jobs.heatmap_view,
+            dataset.dataset_id,
+            dataset.version,
+            _query_signature(params),
+            rows,
+            columns,
+            measure,
+        )
+    except ExecutorBusy as e:
+        return PlainTextResponse(str(e), status_code=503)
+    return JSONResponse(heatmap)
+
+
+async def export_metrics(request: Request):
+    """Serves the var and event metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+api = Starlette(
+    routes=[
+        Route(EXPORT_PATH, export_orders),
+        Route(HEATMAP_PATH, export_heatmap),
+        Route(METRICS_PATH, export_metrics),
+    ]
+)
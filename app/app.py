@@ -1,7 +1,12 @@
 import reflex as rx
 from app.components.main_layout import main_layout
 from app.state import DashboardState
-from app.components.metric_card import metric_card
+from app.components.metric_card import (
+    comparison_mode_button,
+    kpi_change,
+    kpi_sparkline,
+    metric_card,
+)
 from app.components.advanced_charts import (
     sales_vs_profit_chart,
     category_stacked_area_chart,
@@ -11,6 +16,7 @@ from app.components.top_products_table import top_products_table
 from app.components.profit_by_category_chart import profit_by_category_chart
 from app.pages.login import login_page
 from app.pages.register import registration_page
+from app.api import api
 
 
 @rx.page(route="/login")
@@ -28,9 +34,18 @@ def index() -> rx.Component:
     """The main dashboard page."""
     return main_layout(
         rx.el.div(
-            rx.el.h1(
-                "Welcome to your Dashboard",
-                class_name="text-2xl font-bold text-gray-900 mb-6",
+            rx.el.div(
+                rx.el.h1(
+                    "Welcome to your Dashboard",
+                    class_name="text-2xl font-bold text-gray-900",
+                ),
+                rx.el.div(
+                    comparison_mode_button("vs last year", "yoy"),
+                    comparison_mode_button("vs last month", "mom"),
+                    comparison_mode_button("No comparison", "none"),
+                    class_name="flex gap-1",
+                ),
+                class_name="flex flex-wrap items-center justify-between gap-4 mb-6",
             ),
             rx.el.div(
                 metric_card(
@@ -38,24 +53,32 @@ def index() -> rx.Component:
                     f"${DashboardState.total_sales.to_string()}",
                     "dollar-sign",
                     "text-green-600",
+                    kpi_change("total_sales"),
+                    kpi_sparkline("Sales", "#16A34A"),
                 ),
                 metric_card(
                     "Total Profit",
                     f"${DashboardState.total_profit.to_string()}",
                     "trending-up",
                     "text-blue-600",
+                    kpi_change("total_profit"),
+                    kpi_sparkline("Profit", "#2563EB"),
                 ),
                 metric_card(
                     "Total Orders",
                     DashboardState.total_orders.to_string(),
                     "shopping-cart",
                     "text-orange-600",
+                    kpi_change("total_orders"),
+                    kpi_sparkline("Orders", "#EA580C"),
                 ),
                 metric_card(
                     "Profit Margin",
                     f"{DashboardState.profit_margin.to_string()}%",
                     "percent",
                     "text-violet-600",
+                    kpi_change("profit_margin", " pts"),
+                    kpi_sparkline("Profit Margin", "#7C3AED"),
                 ),
                 class_name="grid grid-cols-1 gap-6 sm:grid-cols-2 lg:grid-cols-4",
             ),
@@ -82,4 +105,5 @@ app = rx.App(
             rel="stylesheet",
         ),
     ],
+    api_transformer=api,
 )
\ No newline at end of file
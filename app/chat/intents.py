@@ -0,0 +1,170 @@
+import dataclasses
+import re
+from collections.abc import Callable
+from typing import Any
+from app.data import jobs, views
+from app.data.cache import result_cache
+from app.data.cube import CubeSlice
+from app.data.filters import FilterSignature
+
+# Returns a view of the filtered cube, shared with the dashboard's charts, or
+# the given default when no rows match.
+Aggregate = Callable[..., Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class Intent:
+    """A kind of question the assistant can answer."""
+
+    name: str
+    title: str
+    pattern: re.Pattern
+    answer: Callable[[Aggregate], str]
+
+
+# Registered intents, in the order they are tried.
+INTENTS: dict[str, Intent] = {}
+
+
+def intent(name: str, title: str, *patterns: str) -> Callable:
+    """Registers the decorated function as the answer to queries matching any pattern.
+
+    The function gets an ``Aggregate`` for the filters of the query and returns
+    the answer below ``title``, or "" when there is no data to answer from.
+    """
+
+    def register(answer: Callable[[Aggregate], str]) -> Callable[[Aggregate], str]:
+        pattern = re.compile("|".join(f"(?:{p})" for p in patterns))
+        INTENTS[name] = Intent(name, title, pattern, answer)
+        return answer
+
+    return register
+
+
+def match_intent(query: str) -> Intent | None:
+    """Returns the first registered intent matching a query."""
+    query = query.lower()
+    return next((i for i in INTENTS.values() if i.pattern.search(query)), None)
+
+
+def _answer_key(
+    dataset_id: str, version: int, signature: FilterSignature, name: str
+) -> tuple:
+    return (dataset_id, version, "chat_answer", name, signature)
+
+
+def cached_answer(
+    dataset_id: str, version: int, signature: FilterSignature, name: str
+) -> str | None:
+    """Returns the cached answer to an intent, or None if it was not computed yet."""
+    return result_cache.get(_answer_key(dataset_id, version, signature, name))
+
+
+def remember_answer(
+    dataset_id: str, version: int, signature: FilterSignature, name: str, body: str
+):
+    """Caches an answer computed elsewhere, e.g. in a pool worker process."""
+    result_cache.put(_answer_key(dataset_id, version, signature, name), body)
+
+
+def answer(dataset_id: str, version: int, signature: FilterSignature, name: str) -> str:
+    """Answers an intent for one set of filters and caches the answer."""
+    dataset = jobs.resolve_dataset(dataset_id, version)
+    if dataset is None:
+        return ""
+
+    def aggregate(view_fn: Callable[[CubeSlice], Any], default: Any = None) -> Any:
+        return jobs.cube_result(
+            dataset, signature, view_fn, [] if default is None else default
+        )
+
+    return result_cache.get_or_compute(
+        _answer_key(dataset_id, version, signature, name),
+        lambda: INTENTS[name].answer(aggregate),
+    )
+
+
+@intent(
+    "sales_trend",
+    "📈 **Sales vs Profit Trend Analysis:**",
+    r"sales vs profit",
+    r"sales profit trend",
+)
+def sales_trend(aggregate: Aggregate) -> str:
+    trend_data = aggregate(views.sales_vs_profit_trend)
+    if not trend_data:
+        return ""
+    latest = trend_data[-1]
+    return f"Latest month ({latest['Order Date']}):\n- Sales: ${latest['Sales']:,.2f}\n- Profit: ${latest['Profit']:,.2f}\n- Profit Margin: {latest['Profit Margin']:.1f}%\n\nThe trend shows {('strong' if latest['Profit Margin'] > 15 else 'moderate' if latest['Profit Margin'] > 10 else 'weak')} profitability with a {latest['Profit Margin']:.1f}% margin."
+
+
+@intent(
+    "top_products",
+    "🏆 **Top 5 Selling Products:**",
+    r"top selling products",
+    r"best products",
+)
+def top_products(aggregate: Aggregate) -> str:
+    response = ""
+    for idx, row in enumerate(aggregate(views.top_products)[:5]):
+        response += f"{idx + 1}. {row['Product Name']}: ${row['Sales']:,.2f}\n"
+    return response
+
+
+@intent(
+    "region_category",
+    "🎯 **Regional-Category Performance:**",
+    r"^(?=.*region)(?=.*category)(?=.*(?:perform|best))",
+)
+def region_category(aggregate: Aggregate) -> str:
+    heatmap_data = aggregate(views.regional_category_heatmap)
+    if not heatmap_data:
+        return ""
+    best = max(heatmap_data, key=lambda x: x["Sales"])
+    return f"Best performing combination:\n- Region: **{best['Region']}**\n- Category: **{best['Category']}**\n- Sales: ${best['Sales']:,.2f}\n- Performance Score: {best['Performance Score']:.1f}/100\n\nThis combination generates the highest sales volume in our dataset."
+
+
+@intent(
+    "quantity_profit", "📊 **Quantity vs Profit Analysis:**", r"^(?=.*quantity).*profit"
+)
+def quantity_profit(aggregate: Aggregate) -> str:
+    scatter_data = aggregate(views.quantity_profit_scatter)
+    if not scatter_data:
+        return ""
+    high_profit = max(scatter_data, key=lambda x: x["Profit"])
+    high_quantity = max(scatter_data, key=lambda x: x["Quantity"])
+    return f"""Highest Profit Product:\n- {high_profit["Product Name"]}: ${high_profit["Profit"]:,.2f} profit from {high_profit["Quantity"]} units\n\nHighest Quantity Product:\n- {high_quantity["Product Name"]}: {high_quantity["Quantity"]} units sold, ${high_quantity["Profit"]:,.2f} profit\n\n**Insight:** {("High quantity doesn't always mean high profit" if high_profit["Product Name"] != high_quantity["Product Name"] else "This product excels in both volume and profitability")}."""
+
+
+@intent(
+    "order_volume", "📦 **Order Volume Analysis:**", r"order volume", r"order trend"
+)
+def order_volume(aggregate: Aggregate) -> str:
+    order_data = aggregate(views.order_volume_metrics)
+    if not order_data:
+        return ""
+    latest = order_data[-1]
+    return f"Latest month ({latest['Order Date']}):\n- Order Count: {latest['Order Count']} orders\n- Average Order Value: ${latest['Average Order Value']:.2f}\n- Total Sales: ${latest['Sales']:,.2f}\n\nThe average customer spends ${latest['Average Order Value']:.2f} per order."
+
+
+@intent("profit_margin", "💰 **Profit Margin Analysis:**", r"profit margin")
+def profit_margin(aggregate: Aggregate) -> str:
+    sales = aggregate(views.total_sales, 0.0)
+    margin = (
+        round(aggregate(views.total_profit, 0.0) / sales * 100, 2) if sales > 0 else 0.0
+    )
+    return f"Current overall profit margin: **{margin:.2f}%**\n\nThis is {('excellent (>20%)' if margin > 20 else 'good (15-20%)' if margin > 15 else 'average (10-15%)' if margin > 10 else 'below average (<10%)')} for retail operations."
+
+
+@intent(
+    "category_performance",
+    "📈 **Category Performance Analysis:**",
+    r"^(?=.*category).*(?:best|perform)",
+)
+def category_performance(aggregate: Aggregate) -> str:
+    categories = aggregate(views.category_margins)
+    if not categories:
+        return ""
+    best_sales = max(categories, key=lambda x: x["Sales"])
+    best_margin = max(categories, key=lambda x: x["Profit Margin"])
+    return f"Best by Sales Volume:\n- **{best_sales['Category']}**: ${best_sales['Sales']:,.2f} ({best_sales['Profit Margin']:.1f}% margin)\n\nBest by Profit Margin:\n- **{best_margin['Category']}**: {best_margin['Profit Margin']:.1f}% margin (${best_margin['Sales']:,.2f} sales)\n\n**Recommendation:** Focus on {best_sales['Category']} for volume growth and {best_margin['Category']} for profitability."
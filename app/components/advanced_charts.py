@@ -1,12 +1,12 @@
 import reflex as rx
 from app.state import DashboardState
-from app.components.chart_utils import TOOLTIP_PROPS, chart_container
+from app.components.chart_utils import TOOLTIP_PROPS, chart_container, chart_data
 
 
 def sales_vs_profit_chart() -> rx.Component:
     """Multi-line comparison chart with dual Y-axis showing Sales and Profit trends."""
     return chart_container(
-        "Sales vs Profit Trend (Dual Y-Axis)",
+        f"Sales vs Profit Trend by {DashboardState.trend_granularity} (Dual Y-Axis)",
         rx.recharts.composed_chart(
             rx.recharts.cartesian_grid(
                 horizontal=True, stroke_dasharray="3 3", class_name="opacity-30"
@@ -50,7 +50,17 @@ def sales_vs_profit_chart() -> rx.Component:
                 dot={"fill": "#10B981", "r": 4},
                 name="Profit ($)",
             ),
-            data=DashboardState.sales_vs_profit_trend,
+            rx.recharts.line(
+                data_key="Prior Profit",
+                y_axis_id="right",
+                stroke="#10B981",
+                stroke_width=2,
+                stroke_dasharray="5 5",
+                type_="monotone",
+                dot=False,
+                name="Prior Profit ($)",
+            ),
+            data=chart_data(DashboardState.sales_vs_profit_trend),
             height=350,
             margin={"top": 5, "right": 30, "left": 20, "bottom": 5},
             class_name="[&_.recharts-tooltip-cursor]:fill-blue-50",
@@ -61,7 +71,7 @@ def sales_vs_profit_chart() -> rx.Component:
 def category_stacked_area_chart() -> rx.Component:
     """Stacked area chart showing category contribution over time."""
     return chart_container(
-        "Category Sales Contribution Over Time",
+        f"Category Sales Contribution by {DashboardState.trend_granularity}",
         rx.recharts.area_chart(
             rx.recharts.cartesian_grid(
                 horizontal=True, stroke_dasharray="3 3", class_name="opacity-30"
@@ -101,7 +111,7 @@ def category_stacked_area_chart() -> rx.Component:
                 fill_opacity=0.8,
                 type_="monotone",
             ),
-            data=DashboardState.category_sales_overtime,
+            data=chart_data(DashboardState.category_sales_overtime),
             height=300,
             margin={"top": 5, "right": 20, "left": 20, "bottom": 5},
             class_name="[&_.recharts-tooltip-cursor]:fill-gray-100",
@@ -109,10 +119,31 @@ def category_stacked_area_chart() -> rx.Component:
     )
 
 
+def scatter_mode_button(label: str, mode: str) -> rx.Component:
+    return rx.el.button(
+        label,
+        on_click=DashboardState.set_scatter_mode(mode),
+        class_name=rx.cond(
+            DashboardState.scatter_mode == mode,
+            "px-3 py-1 text-xs font-medium rounded-md bg-violet-100 text-violet-700",
+            "px-3 py-1 text-xs font-medium rounded-md text-gray-500 hover:bg-gray-100",
+        ),
+    )
+
+
 def quantity_profit_scatter() -> rx.Component:
     """Scatter plot showing Quantity vs Profit relationship with bubble sizing by Sales."""
     return chart_container(
-        "Quantity vs Profit Analysis (Bubble Size = Sales)",
+        rx.cond(
+            DashboardState.scatter_mode == "density",
+            "Quantity vs Profit Density (Bubble Size = Products)",
+            "Quantity vs Profit Analysis (Bubble Size = Sales)",
+        ),
+        rx.el.div(
+            scatter_mode_button("Top products", "top"),
+            scatter_mode_button("All products", "density"),
+            class_name="flex gap-1 mb-2",
+        ),
         rx.recharts.scatter_chart(
             rx.recharts.cartesian_grid(
                 horizontal=True,
@@ -144,7 +175,7 @@ def quantity_profit_scatter() -> rx.Component:
             rx.recharts.z_axis(data_key="Bubble Size", range_=[50, 800]),
             rx.recharts.scatter(
                 name="Product Performance",
-                data=DashboardState.quantity_profit_scatter,
+                data=chart_data(DashboardState.quantity_profit_scatter),
                 fill="#FDBA74",
                 shape="circle",
             ),
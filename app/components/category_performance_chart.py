@@ -1,6 +1,6 @@
 import reflex as rx
 from app.state import DashboardState
-from app.components.chart_utils import TOOLTIP_PROPS, chart_container
+from app.components.chart_utils import TOOLTIP_PROPS, chart_container, chart_data
 
 
 def category_performance_chart() -> rx.Component:
@@ -21,7 +21,7 @@ def category_performance_chart() -> rx.Component:
                 tick_margin=5,
             ),
             rx.recharts.bar(data_key="Sales", fill="#818CF8", radius=[0, 4, 4, 0]),
-            data=DashboardState.category_performance,
+            data=chart_data(DashboardState.category_performance),
             height=300,
             layout="vertical",
             margin={"top": 5, "right": 20, "left": 20, "bottom": 5},
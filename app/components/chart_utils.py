@@ -1,4 +1,8 @@
 import reflex as rx
+from typing import Any
+from reflex.event import EventChain, no_args_event_spec
+from reflex.vars.function import FunctionStringVar
+from app.state import DashboardState
 
 TOOLTIP_PROPS = {
     "content_style": {
@@ -16,11 +20,77 @@ TOOLTIP_PROPS = {
     "separator": ": ",
 }
 
+# Expands columnar chart data (see app.data.encoding) back into the records
+# recharts expects, once per payload the backend sends. Payloads with a "base"
+# revision carry only the changes since that revision of the same series.
+# Changes to a revision the page never decoded (e.g. two updates rendered in
+# one pass) ask the backend, once per payload, to resend every chart whole.
+_DECODE_CHART_DATA = FunctionStringVar.create(
+    """(data, resync) => {
+  if (!data || Array.isArray(data)) return data ?? [];
+  const decoded = (globalThis.__decodedChartData ??= new WeakMap());
+  const series = (globalThis.__chartSeries ??= {});
+  if (!decoded.has(data)) {
+    let chart = data;
+    if (data.base !== undefined) {
+      const last = series[data.series];
+      if (last?.revision !== data.base) {
+        const resyncs = (globalThis.__chartResyncs ??= new WeakSet());
+        if (!resyncs.has(data)) {
+          resyncs.add(data);
+          queueMicrotask(() => resync());
+        }
+        return last?.records ?? [];
+      }
+      const columns = { ...last.columns, ...data.columns };
+      const labels = { ...last.labels };
+      for (const name of data.dropped) {
+        delete columns[name];
+        delete labels[name];
+      }
+      for (const name of Object.keys(data.columns)) {
+        if (name in data.labels) labels[name] = data.labels[name];
+        else delete labels[name];
+      }
+      for (const [name, points] of Object.entries(data.points)) {
+        const values = (columns[name] = [...columns[name]]);
+        for (const [row, value] of points) values[row] = value;
+      }
+      chart = { length: data.length, columns, labels };
+    }
+    const names = Object.keys(chart.columns);
+    const records = Array.from({ length: chart.length }, (_, row) => {
+      const record = {};
+      for (const name of names) {
+        const value = chart.columns[name][row];
+        record[name] = name in chart.labels ? chart.labels[name][value] : value;
+      }
+      return record;
+    });
+    if (data.series !== undefined) {
+      series[data.series] = { ...chart, revision: data.revision, records };
+    }
+    decoded.set(data, records);
+  }
+  return decoded.get(data);
+}"""
+)
 
-def chart_container(title: str, chart: rx.Component) -> rx.Component:
+
+def chart_data(data: rx.Var) -> rx.Var:
+    """Returns the records of a chart data var, for the ``data`` prop of a chart."""
+    resync = rx.Var.create(
+        EventChain.create(
+            DashboardState.resync_charts, args_spec=no_args_event_spec, key=""
+        )
+    )
+    return _DECODE_CHART_DATA.call(data, resync).to(list[dict[str, Any]])
+
+
+def chart_container(title: str | rx.Var, *children: rx.Component) -> rx.Component:
     return rx.el.div(
         rx.el.h3(title, class_name="text-lg font-semibold text-gray-800 mb-4"),
-        chart,
+        *children,
         class_name="rounded-lg border bg-white p-6 transition-all hover:shadow-lg",
         style={"box-shadow": "0px 1px 3px rgba(0,0,0,0.12)"},
     )
\ No newline at end of file
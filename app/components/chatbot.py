@@ -60,7 +60,12 @@ def chatbot() -> rx.Component:
                         ChatState.is_processing,
                         rx.el.div(
                             rx.spinner(class_name="h-5 w-5 text-violet-600"),
-                            class_name="flex justify-center p-4",
+                            rx.el.button(
+                                "Stop",
+                                on_click=ChatState.cancel_query,
+                                class_name="text-xs text-gray-500 hover:text-violet-600",
+                            ),
+                            class_name="flex justify-center items-center gap-3 p-4",
                         ),
                         None,
                     ),
@@ -84,8 +89,7 @@ def chatbot() -> rx.Component:
                             rx.icon("send", class_name="h-5 w-5 text-white"),
                             type_="submit",
                             class_name="p-2 bg-violet-600 rounded-full hover:bg-violet-700 disabled:opacity-50",
-                            disabled=ChatState.is_processing
-                            | (ChatState.current_input.strip() == ""),
+                            disabled=ChatState.current_input.strip() == "",
                         ),
                         on_submit=ChatState.handle_submit,
                         reset_on_submit=True,
@@ -1,8 +1,75 @@
 import reflex as rx
+from app.components.chart_utils import chart_data
+from app.state import DashboardState
+
+
+def kpi_change(name: str, unit: str = "%") -> rx.Component:
+    """The change of a KPI since the prior window of the comparison mode."""
+    change = DashboardState.kpi_changes[name]
+    return rx.cond(
+        DashboardState.kpi_changes.contains(name),
+        rx.el.p(
+            rx.cond(change >= 0, "+", ""),
+            change.to_string(),
+            f"{unit} ",
+            rx.cond(
+                DashboardState.comparison_mode == "mom",
+                rx.cond(
+                    DashboardState.kpi_changes_latest,
+                    "latest month vs the one before",
+                    "vs last month",
+                ),
+                rx.cond(
+                    DashboardState.kpi_changes_latest,
+                    "last 12 months vs the 12 before",
+                    "vs last year",
+                ),
+            ),
+            class_name=rx.cond(
+                change >= 0,
+                "text-xs font-medium text-green-600",
+                "text-xs font-medium text-red-600",
+            ),
+        ),
+        None,
+    )
+
+
+def kpi_sparkline(data_key: str, color: str) -> rx.Component:
+    """A small line of a KPI over the latest periods of the date range."""
+    return rx.recharts.line_chart(
+        rx.recharts.line(
+            data_key=data_key,
+            stroke=color,
+            stroke_width=1.5,
+            dot=False,
+            is_animation_active=False,
+        ),
+        data=chart_data(DashboardState.kpi_sparkline),
+        height=40,
+        margin={"top": 4, "right": 0, "left": 0, "bottom": 0},
+    )
+
+
+def comparison_mode_button(label: str, mode: str) -> rx.Component:
+    return rx.el.button(
+        label,
+        on_click=DashboardState.set_comparison_mode(mode),
+        class_name=rx.cond(
+            DashboardState.comparison_mode == mode,
+            "px-3 py-1 text-xs font-medium rounded-md bg-violet-100 text-violet-700",
+            "px-3 py-1 text-xs font-medium rounded-md text-gray-500 hover:bg-gray-100",
+        ),
+    )
 
 
 def metric_card(
-    title: str, value: rx.Var[str | int | float], icon_name: str, color: str
+    title: str,
+    value: rx.Var[str | int | float],
+    icon_name: str,
+    color: str,
+    change: rx.Component | None = None,
+    sparkline: rx.Component | None = None,
 ) -> rx.Component:
     """A card component to display a key metric."""
     return rx.el.div(
@@ -13,7 +80,9 @@ def metric_card(
         rx.el.div(
             rx.el.p(title, class_name="text-sm font-medium text-gray-500"),
             rx.el.p(value, class_name="text-2xl font-bold text-gray-900"),
-            class_name="flex-1",
+            change,
+            sparkline,
+            class_name="flex-1 min-w-0",
         ),
         class_name="flex items-center gap-4 rounded-lg border bg-white p-4 transition-all hover:shadow-lg",
         style={"box-shadow": "0px 1px 3px rgba(0,0,0,0.12)"},
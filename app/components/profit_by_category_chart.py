@@ -1,6 +1,6 @@
 import reflex as rx
 from app.state import DashboardState
-from app.components.chart_utils import TOOLTIP_PROPS, chart_container
+from app.components.chart_utils import TOOLTIP_PROPS, chart_container, chart_data
 
 
 def profit_by_category_chart() -> rx.Component:
@@ -18,7 +18,7 @@ def profit_by_category_chart() -> rx.Component:
             ),
             rx.recharts.y_axis(tick_line=False, axis_line=False),
             rx.recharts.bar(data_key="Profit", fill="#34D399", radius=[4, 4, 0, 0]),
-            data=DashboardState.profit_by_category,
+            data=chart_data(DashboardState.profit_by_category),
             height=300,
             margin={"top": 5, "right": 20, "left": 20, "bottom": 5},
             class_name="[&_.recharts-tooltip-cursor]:fill-gray-100",
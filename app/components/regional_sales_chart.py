@@ -1,6 +1,6 @@
 import reflex as rx
 from app.state import DashboardState
-from app.components.chart_utils import TOOLTIP_PROPS, chart_container
+from app.components.chart_utils import TOOLTIP_PROPS, chart_container, chart_data
 
 
 def regional_sales_chart() -> rx.Component:
@@ -14,7 +14,7 @@ def regional_sales_chart() -> rx.Component:
             ),
             rx.recharts.y_axis(tick_line=False, axis_line=False),
             rx.recharts.bar(data_key="Sales", fill="#A5B4FC", radius=[4, 4, 0, 0]),
-            data=DashboardState.regional_sales,
+            data=chart_data(DashboardState.regional_sales),
             height=300,
             margin={"top": 5, "right": 20, "left": 20, "bottom": 5},
             class_name="[&_.recharts-tooltip-cursor]:fill-gray-100",
@@ -1,11 +1,11 @@
 import reflex as rx
 from app.state import DashboardState
-from app.components.chart_utils import TOOLTIP_PROPS, chart_container
+from app.components.chart_utils import TOOLTIP_PROPS, chart_container, chart_data
 
 
 def sales_trend_chart() -> rx.Component:
     return chart_container(
-        "Sales Trend",
+        f"Sales Trend by {DashboardState.trend_granularity}",
         rx.recharts.line_chart(
             rx.recharts.cartesian_grid(horizontal=True, stroke_dasharray="3 3"),
             rx.recharts.graphing_tooltip(**TOOLTIP_PROPS),
@@ -20,7 +20,15 @@ def sales_trend_chart() -> rx.Component:
                 type_="natural",
                 dot=False,
             ),
-            data=DashboardState.sales_trend_data,
+            rx.recharts.line(
+                data_key="Prior Sales",
+                stroke="#6366F1",
+                stroke_width=2,
+                stroke_dasharray="5 5",
+                type_="natural",
+                dot=False,
+            ),
+            data=chart_data(DashboardState.sales_trend_data),
             height=300,
             margin={"top": 5, "right": 20, "left": 20, "bottom": 5},
             class_name="[&_.recharts-tooltip-cursor]:stroke-gray-300",
@@ -0,0 +1,116 @@
+import collections
+import pickle
+import threading
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+
+import pandas as pd
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def estimate_size(value: Any) -> int:
+    """Returns a rough size in bytes of a cached value."""
+    if isinstance(value, pd.DataFrame):
+        # Shallow accounting keeps this cheap; it undercounts object columns.
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if hasattr(value, "__dataclass_fields__"):
+        return sum(
+            estimate_size(getattr(value, name)) for name in value.__dataclass_fields__
+        )
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return 0
+
+
+class ResultCache:
+    """Thread-safe LRU cache shared by every session in the process.
+
+    Keys start with the dataset id and version so that entries for a dataset
+    can be dropped as soon as a new version of it is published. Entries are
+    evicted least-recently-used first when either the entry count or the
+    estimated total size exceeds its limit.
+    """
+
+    def __init__(
+        self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries: collections.OrderedDict[Hashable, tuple[Any, int]] = (
+            collections.OrderedDict()
+        )
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: tuple[Hashable, ...], default: Any = None) -> Any:
+        """Returns the cached value for key, or ``default`` without computing it."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_or_compute(self, key: tuple[Hashable, ...], compute: Callable[[], T]) -> T:
+        """Returns the cached value for key, computing and storing it on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def put(self, key: tuple[Hashable, ...], value: Any):
+        """Stores a value, evicting least recently used entries if needed."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def invalidate(self, dataset_id: str, keep_version: int | None = None):
+        """Drops every entry of a dataset, optionally keeping one version."""
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if key[0] == dataset_id and key[1] != keep_version
+            ]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+result_cache = ResultCache()
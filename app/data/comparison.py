@@ -0,0 +1,38 @@
+import pandas as pd
+
+# Months each comparison mode looks back.
+COMPARISON_MONTHS = {"yoy": 12, "mom": 1}
+
+
+def shift_dates(dates: pd.DatetimeIndex, months: int) -> pd.DatetimeIndex:
+    """Returns each date ``months`` earlier; month ends stay month ends."""
+    month_ends = dates + pd.offsets.MonthEnd(-months)
+    return month_ends.where(dates.is_month_end, dates - pd.DateOffset(months=months))
+
+
+def _change(current: float, prior: float) -> float | None:
+    if not prior:
+        return None
+    return round((current - prior) / abs(prior) * 100, 1)
+
+
+def kpi_changes(current: dict[str, float], prior: dict[str, float]) -> dict[str, float]:
+    """Returns the change of each KPI between the totals of two windows.
+
+    Totals change in percent and the profit margin in percentage points. KPIs
+    without a prior value are left out.
+    """
+    changes = {
+        name: _change(current[name], prior[name])
+        for name in ("total_sales", "total_profit", "total_orders")
+    }
+    if current["total_sales"] > 0 and prior["total_sales"] > 0:
+        changes["profit_margin"] = round(
+            (
+                current["total_profit"] / current["total_sales"]
+                - prior["total_profit"] / prior["total_sales"]
+            )
+            * 100,
+            2,
+        )
+    return {name: change for name, change in changes.items() if change is not None}
@@ -0,0 +1,157 @@
+import dataclasses
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ["Order Month", "Region", "Category", "Product Name"]
+CUBE_MEASURES = ["Sales", "Profit", "Quantity"]
+# Measures are summed in wide types even when the table stores them compactly.
+MEASURE_DTYPES = {"Sales": "float64", "Profit": "float64", "Quantity": "int64"}
+# Pair masks wider than this fall back to Python ints in an object column.
+MAX_INT64_PAIRS = 62
+
+
+@dataclasses.dataclass(frozen=True)
+class Cube:
+    """Pre-aggregated Sales/Profit/Quantity per (month, region, category, product).
+
+    Distinct order counts are not additive across cells, so they are kept in a
+    separate table counting orders per month and per bitmask of the
+    (Region, Category) pairs each order contains.
+    """
+
+    cells: pd.DataFrame
+    orders: pd.DataFrame
+    pairs: list[tuple[str, str]]
+
+
+@dataclasses.dataclass(frozen=True)
+class CubeSlice:
+    """The cube cells and order counts matching a set of filters."""
+
+    cells: pd.DataFrame
+    orders: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        return self.cells.empty
+
+
+def aggregate_cells(frame: pd.DataFrame) -> pd.DataFrame:
+    """Sums the cube measures per cube cell."""
+    measures = frame[CUBE_MEASURES].astype(MEASURE_DTYPES)
+    return (
+        measures.groupby(
+            [frame[column] for column in CUBE_DIMENSIONS], observed=True, dropna=False
+        )
+        .sum()
+        .reset_index()
+    )
+
+
+def aggregate_orders(
+    frame: pd.DataFrame, pairs: list[tuple[str, str]], period: str = "Order Month"
+) -> pd.DataFrame:
+    """Counts distinct orders per ``period`` and (Region, Category) pair bitmask."""
+    pair_index = pd.MultiIndex.from_tuples(pairs, names=["Region", "Category"])
+    positions = pair_index.get_indexer(
+        pd.MultiIndex.from_frame(frame[["Region", "Category"]])
+    )
+    if len(pairs) <= MAX_INT64_PAIRS:
+        bits = np.where(positions >= 0, np.left_shift(1, positions.clip(0)), 0)
+    else:
+        bits = np.array([1 << p if p >= 0 else 0 for p in positions], dtype=object)
+    # Summing the distinct bits of each order is equivalent to OR-ing them.
+    per_order = (
+        pd.DataFrame(
+            {
+                "Order ID": frame["Order ID"].to_numpy(),
+                period: frame[period].to_numpy(),
+                "Pair Mask": bits,
+            }
+        )
+        .drop_duplicates(["Order ID", "Pair Mask"])
+        .groupby("Order ID", sort=False)
+        .agg({period: "first", "Pair Mask": "sum"})
+    )
+    return (
+        per_order.groupby([period, "Pair Mask"], dropna=False)
+        .size()
+        .rename("Orders")
+        .reset_index()
+    )
+
+
+def pair_mask(
+    pairs: list[tuple[str, str]],
+    categories: tuple[str, ...],
+    regions: tuple[str, ...],
+) -> int:
+    """Returns the bitmask of the (Region, Category) pairs matching the filters."""
+    selected = 0
+    for bit, (region, category) in enumerate(pairs):
+        if (not regions or region in regions) and (
+            not categories or category in categories
+        ):
+            selected |= 1 << bit
+    return selected
+
+
+def region_category_pairs(frame: pd.DataFrame) -> list[tuple[str, str]]:
+    """Returns the (Region, Category) pairs of a frame, in order of appearance."""
+    return list(
+        frame[["Region", "Category"]]
+        .drop_duplicates()
+        .dropna()
+        .itertuples(index=False, name=None)
+    )
+
+
+def build_cube(frame: pd.DataFrame) -> Cube:
+    """Builds the cube from a normalized Superstore frame."""
+    pairs = region_category_pairs(frame)
+    return Cube(
+        cells=aggregate_cells(frame),
+        orders=aggregate_orders(frame, pairs),
+        pairs=pairs,
+    )
+
+
+def slice_cube(
+    cube: Cube,
+    date_rows: pd.DataFrame,
+    start: str,
+    end: str,
+    categories: tuple[str, ...],
+    regions: tuple[str, ...],
+) -> CubeSlice:
+    """Returns the cube cells and order counts matching the filters.
+
+    Months entirely inside the date range are answered from the cube; the
+    rows of ``date_rows`` (the table rows inside the range) that fall in
+    partially covered edge months are aggregated on the fly and appended.
+    """
+    cells = cube.cells
+    orders = cube.orders
+    if start and end:
+        start_date = pd.to_datetime(start)
+        end_date = pd.to_datetime(end)
+        months = cells["Order Month"]
+        month_ends = months + pd.offsets.MonthBegin(1) - pd.Timedelta(1, "ns")
+        inside = (months >= start_date) & (month_ends <= end_date)
+        covered = months[inside].unique()
+        edge_rows = date_rows[~date_rows["Order Month"].isin(covered)]
+        cells = pd.concat([cells[inside], aggregate_cells(edge_rows)])
+        orders = pd.concat(
+            [
+                orders[orders["Order Month"].isin(covered)],
+                aggregate_orders(edge_rows, cube.pairs),
+            ]
+        )
+    if categories:
+        cells = cells[cells["Category"].isin(categories)]
+    if regions:
+        cells = cells[cells["Region"].isin(regions)]
+    if categories or regions:
+        selected = pair_mask(cube.pairs, categories, regions)
+        orders = orders[(orders["Pair Mask"].to_numpy() & selected) != 0]
+    return CubeSlice(cells=cells, orders=orders)
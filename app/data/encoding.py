@@ -0,0 +1,89 @@
+import math
+from typing import Any
+
+# Chart data as stored on the state: records, or their columnar encoding.
+ChartData = list[dict[str, Any]] | dict[str, Any]
+
+
+def _round(value: Any, digits: int) -> Any:
+    if not isinstance(value, float) or not math.isfinite(value):
+        return value
+    value = round(value, digits)
+    return int(value) if value.is_integer() else value
+
+
+def encode_records(records: list[dict[str, Any]], digits: int = 2) -> dict[str, Any]:
+    """Encodes chart records column by column for the browser.
+
+    Floats are rounded to ``digits`` decimals, and string columns that repeat
+    values are sent once as labels plus the index of each record's label.
+    """
+    columns: dict[str, list] = {}
+    labels: dict[str, list[str]] = {}
+    for name in records[0] if records else ():
+        values = [record.get(name) for record in records]
+        if all(isinstance(value, str) for value in values):
+            distinct = list(dict.fromkeys(values))
+            if len(distinct) < len(values):
+                positions = {label: i for i, label in enumerate(distinct)}
+                labels[name] = distinct
+                values = [positions[value] for value in values]
+        else:
+            values = [_round(value, digits) for value in values]
+        columns[name] = values
+    return {"length": len(records), "columns": columns, "labels": labels}
+
+
+def decode_records(data: ChartData) -> list[dict[str, Any]]:
+    """Returns the records of chart data, decoding it if it is columnar."""
+    if isinstance(data, list):
+        return data
+    columns, labels = data["columns"], data["labels"]
+    decoded = {
+        name: [labels[name][i] for i in values] if name in labels else values
+        for name, values in columns.items()
+    }
+    return [
+        {name: values[row] for name, values in decoded.items()}
+        for row in range(data["length"])
+    ]
+
+
+def diff_columns(previous: dict[str, Any], current: dict[str, Any]) -> dict | None:
+    """Returns the changes between two columnar encodings of a chart.
+
+    Columns that are new, relabelled or changed in more than half of their rows
+    are sent whole with their labels, other changed columns as ``[row, value]``
+    points. Returns None when every column would be sent whole anyway.
+    """
+    if previous["length"] != current["length"]:
+        return None
+    columns: dict[str, list] = {}
+    labels: dict[str, list[str]] = {}
+    points: dict[str, list[list]] = {}
+    for name, values in current["columns"].items():
+        before = previous["columns"].get(name)
+        relabelled = current["labels"].get(name) != previous["labels"].get(name)
+        if before is not None and not relabelled:
+            changed = [
+                [row, value]
+                for row, (old, value) in enumerate(zip(before, values))
+                if old != value
+            ]
+            if len(changed) * 2 <= len(values):
+                if changed:
+                    points[name] = changed
+                continue
+        columns[name] = values
+        if name in current["labels"]:
+            labels[name] = current["labels"][name]
+    if columns.keys() == current["columns"].keys():
+        return None
+    dropped = [name for name in previous["columns"] if name not in current["columns"]]
+    return {
+        "length": current["length"],
+        "columns": columns,
+        "labels": labels,
+        "points": points,
+        "dropped": dropped,
+    }
@@ -0,0 +1,44 @@
+import urllib.parse
+import zlib
+from collections.abc import Iterator
+import pandas as pd
+from app.data.filters import FilterSignature
+from app.data.ingest import DERIVED_COLUMNS
+
+EXPORT_BATCH_ROWS = 10_000
+EXPORT_PATH = "/export/orders.csv"
+
+
+def export_query(signature: FilterSignature, compress: bool = False) -> str:
+    """Returns the query string describing a filter selection for export."""
+    params: list[tuple[str, str]] = []
+    if signature.start and signature.end:
+        params += [("start", signature.start), ("end", signature.end)]
+    params += [("category", category) for category in signature.categories]
+    params += [("region", region) for region in signature.regions]
+    if compress:
+        params.append(("gzip", "1"))
+    return urllib.parse.urlencode(params)
+
+
+def iter_csv(
+    rows: pd.DataFrame, batch_rows: int = EXPORT_BATCH_ROWS
+) -> Iterator[bytes]:
+    """Yields the rows as CSV, encoding one batch of rows at a time."""
+    columns = [column for column in rows.columns if column not in DERIVED_COLUMNS]
+    if rows.empty:
+        yield ",".join(columns).encode() + b"\n"
+        return
+    for start in range(0, len(rows), batch_rows):
+        batch = rows.iloc[start : start + batch_rows][columns]
+        yield batch.to_csv(index=False, header=start == 0).encode()
+
+
+def iter_gzip(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip-compresses a stream of byte chunks."""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,201 @@
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+from app.data.cache import result_cache
+from app.data.cube import CubeSlice, slice_cube
+from app.data.indexes import SEARCH_COLUMNS
+from app.data.store import Dataset
+
+
+DATE_PRESETS = ["30d", "90d", "year", "last_year"]
+
+
+class FilterSignature(NamedTuple):
+    """Canonical, hashable form of a dashboard filter selection."""
+
+    start: str = ""
+    end: str = ""
+    categories: tuple[str, ...] = ()
+    regions: tuple[str, ...] = ()
+    search: str = ""
+
+
+def _normalize_date(value: str) -> str:
+    try:
+        return pd.Timestamp(value).isoformat()
+    except (ValueError, TypeError):
+        return value
+
+
+def filter_signature(
+    date_range: dict[str, str],
+    categories: list[str],
+    regions: list[str],
+    search_query: str = "",
+) -> FilterSignature:
+    """Returns the canonical signature of a filter selection.
+
+    Selections that produce the same rows map to the same signature, e.g.
+    categories picked in a different order or a half-filled date range.
+    """
+    start = date_range.get("start", "")
+    end = date_range.get("end", "")
+    if not (start and end):
+        start = end = ""
+    return FilterSignature(
+        start=_normalize_date(start) if start else "",
+        end=_normalize_date(end) if end else "",
+        categories=tuple(sorted(set(categories))),
+        regions=tuple(sorted(set(regions))),
+        search=search_query.lower() if search_query.strip() else "",
+    )
+
+
+def resolve_date_preset(preset: str, latest: pd.Timestamp | None) -> dict[str, str]:
+    """Returns the date range of a preset such as "30d" or "last_year".
+
+    Presets are relative to the latest order in the dataset rather than to
+    today, so historical extracts still show data for "Last 30 Days".
+    """
+    if latest is None or preset not in DATE_PRESETS:
+        return {"start": "", "end": ""}
+    end = latest.normalize()
+    if preset == "30d":
+        start = end - pd.Timedelta(days=30)
+    elif preset == "90d":
+        start = end - pd.Timedelta(days=90)
+    elif preset == "year":
+        start = end.replace(month=1, day=1)
+    else:
+        start = end.replace(year=end.year - 1, month=1, day=1)
+        end = end.replace(year=end.year - 1, month=12, day=31)
+    return {"start": start.strftime("%Y-%m-%d"), "end": end.strftime("%Y-%m-%d")}
+
+
+def date_slice(dataset: Dataset, signature: FilterSignature) -> slice:
+    """Returns the contiguous row slice matching the signature's date range."""
+    if not (signature.start and signature.end) or dataset.indexes is None:
+        return slice(None)
+    return dataset.indexes.dates.slice(
+        pd.to_datetime(signature.start), pd.to_datetime(signature.end)
+    )
+
+
+def _mask_rows(df: pd.DataFrame, signature: FilterSignature) -> pd.DataFrame:
+    """Filters an unindexed frame with plain boolean masks."""
+    if signature.start and signature.end:
+        start_date = pd.to_datetime(signature.start)
+        end_date = pd.to_datetime(signature.end)
+        df = df[(df["Order Date"] >= start_date) & (df["Order Date"] <= end_date)]
+    if signature.categories:
+        df = df[df["Category"].isin(signature.categories)]
+    if signature.regions:
+        df = df[df["Region"].isin(signature.regions)]
+    return df
+
+
+def _date_rows(dataset: Dataset, signature: FilterSignature) -> pd.DataFrame:
+    if dataset.indexes is None:
+        return _mask_rows(dataset.frame, signature._replace(categories=(), regions=()))
+    return dataset.frame.iloc[date_slice(dataset, signature)]
+
+
+def _filter_rows(dataset: Dataset, signature: FilterSignature) -> pd.DataFrame:
+    df = dataset.frame
+    if dataset.indexes is None:
+        return _mask_rows(df, signature)
+    rows = date_slice(dataset, signature)
+    bits = dataset.indexes.select(
+        {"Category": signature.categories, "Region": signature.regions}
+    )
+    if bits is None:
+        return df.iloc[rows]
+    return df.take(dataset.indexes.rows(bits, within=rows))
+
+
+def filtered_frame(dataset: Dataset, signature: FilterSignature) -> pd.DataFrame:
+    """Returns the rows of a shared dataset matching the given filters."""
+    signature = signature._replace(search="")
+    return result_cache.get_or_compute(
+        (dataset.dataset_id, dataset.version, "filtered_frame", signature),
+        lambda: _filter_rows(dataset, signature),
+    )
+
+
+def _search_rows(dataset: Dataset, rows: pd.DataFrame, search: str) -> pd.DataFrame:
+    if dataset.indexes is None:
+        mask = pd.Series(False, index=rows.index)
+        for column in SEARCH_COLUMNS:
+            mask |= (
+                rows[column].astype(str).str.lower().str.contains(search, regex=False)
+            )
+        return rows[mask]
+    # The shared frame has a RangeIndex, so row labels are row positions.
+    matches = dataset.indexes.search.search(search)
+    return rows[matches[rows.index.to_numpy()]]
+
+
+def _select_rows(dataset: Dataset, signature: FilterSignature) -> np.ndarray | None:
+    size = len(dataset.frame)
+    indexes = dataset.indexes
+    if indexes is None:
+        rows = matching_rows(dataset, signature)
+        if len(rows) == size:
+            return None
+        selected = np.zeros(size, dtype=bool)
+        selected[rows.index.to_numpy()] = True
+        return selected
+    within = date_slice(dataset, signature)
+    bits = indexes.select(
+        {"Category": signature.categories, "Region": signature.regions}
+    )
+    if bits is None and within == slice(None) and not signature.search:
+        return None
+    if bits is None:
+        selected = np.ones(size, dtype=bool)
+    else:
+        selected = np.unpackbits(bits, count=size).view(bool)
+    selected[: within.start or 0] = False
+    if within.stop is not None:
+        selected[within.stop :] = False
+    if signature.search:
+        selected &= indexes.search.search(signature.search)
+    return selected
+
+
+def selected_rows(dataset: Dataset, signature: FilterSignature) -> np.ndarray | None:
+    """Returns a boolean mask of the rows matching the filters and search text.
+
+    The mask combines the date slice, the category and region bitmaps and the
+    search index without copying any rows. None means every row matches.
+    """
+    return result_cache.get_or_compute(
+        (dataset.dataset_id, dataset.version, "selected_rows", signature),
+        lambda: _select_rows(dataset, signature),
+    )
+
+
+def matching_rows(dataset: Dataset, signature: FilterSignature) -> pd.DataFrame:
+    """Returns the filtered and searched rows without caching them."""
+    rows = _filter_rows(dataset, signature._replace(search=""))
+    if not signature.search or rows.empty:
+        return rows
+    return _search_rows(dataset, rows, signature.search)
+
+
+def sliced_cube(dataset: Dataset, signature: FilterSignature) -> CubeSlice | None:
+    """Returns the cube slice of a shared dataset matching the given filters."""
+    if dataset.cube is None:
+        return None
+    signature = signature._replace(search="")
+    return result_cache.get_or_compute(
+        (dataset.dataset_id, dataset.version, "sliced_cube", signature),
+        lambda: slice_cube(
+            dataset.cube,
+            _date_rows(dataset, signature),
+            signature.start,
+            signature.end,
+            signature.categories,
+            signature.regions,
+        ),
+    )
@@ -0,0 +1,222 @@
+import dataclasses
+import numpy as np
+import pandas as pd
+
+BITMAP_COLUMNS = ["Category", "Sub-Category", "Region", "Segment", "Ship Mode", "State"]
+SEARCH_COLUMNS = ["Product Name", "Category", "Customer Name", "Region"]
+SORT_COLUMNS = [
+    "Order Date",
+    "Product Name",
+    "Category",
+    "Sales",
+    "Quantity",
+    "Profit",
+    "Customer Name",
+    "Region",
+]
+NGRAM_SIZE = 3
+
+
+class DateIndex:
+    """Binary-search index over a frame sorted by a date column."""
+
+    def __init__(self, dates: pd.Series):
+        self.dates = dates.to_numpy()
+        # NaT sorts last, so valid dates form a prefix of the column.
+        self.valid = int(dates.notna().sum())
+
+    @property
+    def earliest(self) -> pd.Timestamp | None:
+        return pd.Timestamp(self.dates[0]) if self.valid else None
+
+    @property
+    def latest(self) -> pd.Timestamp | None:
+        return pd.Timestamp(self.dates[self.valid - 1]) if self.valid else None
+
+    def slice(self, start: pd.Timestamp, end: pd.Timestamp) -> slice:
+        """Returns the row slice with dates in the inclusive range [start, end]."""
+        dates = self.dates[: self.valid]
+        return slice(
+            int(dates.searchsorted(start.to_datetime64(), side="left")),
+            int(dates.searchsorted(end.to_datetime64(), side="right")),
+        )
+
+
+class BitmapIndex:
+    """Packed row bitmaps, one per distinct value of a categorical column."""
+
+    def __init__(self, values: pd.Series):
+        self.size = len(values)
+        codes, uniques = pd.factorize(values)
+        self.bitmaps: dict[str, np.ndarray] = {
+            value: np.packbits(codes == code) for code, value in enumerate(uniques)
+        }
+
+    def empty(self) -> np.ndarray:
+        return np.zeros((self.size + 7) // 8, dtype=np.uint8)
+
+    def select(self, values: tuple[str, ...]) -> np.ndarray:
+        """Returns the packed bitmap of rows holding any of the values."""
+        selected = [self.bitmaps[value] for value in values if value in self.bitmaps]
+        if not selected:
+            return self.empty()
+        return np.bitwise_or.reduce(selected)
+
+
+class SortIndex:
+    """Precomputed ascending row order of one column, missing values last."""
+
+    def __init__(self, values: pd.Series):
+        ordered = values.sort_values(kind="stable", na_position="last")
+        # The shared frame has a RangeIndex, so row labels are row positions.
+        self.order = ordered.index.to_numpy(dtype=np.int32)
+        self.valid = int(ordered.notna().sum())
+
+    def walk(self, descending: bool) -> np.ndarray:
+        """Returns the row order, keeping missing values last when descending."""
+        if not descending:
+            return self.order
+        return np.concatenate(
+            [self.order[: self.valid][::-1], self.order[self.valid :]]
+        )
+
+    def page(
+        self, selected: np.ndarray | None, descending: bool, start: int, stop: int
+    ) -> np.ndarray:
+        """Returns the positions of the selected rows ranked [start, stop).
+
+        The permutation is walked in growing chunks until enough selected
+        rows are found, so a page costs about ``stop / selectivity`` lookups
+        instead of a sort of the whole selection.
+        """
+        order = self.walk(descending)
+        if selected is None:
+            return order[start:stop]
+        found: list[np.ndarray] = []
+        count = 0
+        position = 0
+        chunk = max(stop * 4, 1024)
+        while position < len(order) and count < stop:
+            block = order[position : position + chunk]
+            hits = block[selected[block]]
+            found.append(hits)
+            count += len(hits)
+            position += chunk
+            chunk *= 2
+        if not found:
+            return order[:0]
+        return np.concatenate(found)[start:stop]
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+class SearchIndex:
+    """Case-insensitive substring index over the searchable columns.
+
+    Every distinct value ("term") of the searched columns is indexed by its
+    trigrams, and each term keeps the sorted positions of the rows holding it.
+    A query intersects the posting lists of its trigrams, verifies the
+    surviving terms and unions their rows, so the cost depends on the number
+    of matches rather than on the size of the table.
+    """
+
+    def __init__(self, frame: pd.DataFrame, columns: list[str] = SEARCH_COLUMNS):
+        self.size = len(frame)
+        self.terms: list[str] = []
+        term_rows: list[np.ndarray] = []
+        for column in columns:
+            codes, uniques = pd.factorize(frame[column])
+            order = np.argsort(codes, kind="stable").astype(np.int32)
+            bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+            for code, value in enumerate(uniques):
+                self.terms.append(str(value).lower())
+                term_rows.append(order[bounds[code] : bounds[code + 1]])
+        self.term_rows = term_rows
+        postings: dict[str, list[int]] = {}
+        for term_id, term in enumerate(self.terms):
+            for gram in _ngrams(term):
+                postings.setdefault(gram, []).append(term_id)
+        self.postings = {
+            gram: np.array(term_ids, dtype=np.int32)
+            for gram, term_ids in postings.items()
+        }
+
+    def matching_terms(self, query: str) -> list[int]:
+        """Returns the ids of the terms containing the lower-cased query."""
+        if len(query) < NGRAM_SIZE:
+            return [i for i, term in enumerate(self.terms) if query in term]
+        candidates = None
+        for gram in sorted(_ngrams(query), key=lambda g: len(self.postings.get(g, ()))):
+            term_ids = self.postings.get(gram)
+            if term_ids is None:
+                return []
+            candidates = (
+                term_ids
+                if candidates is None
+                else np.intersect1d(candidates, term_ids, assume_unique=True)
+            )
+            if not len(candidates):
+                return []
+        return [int(i) for i in candidates if query in self.terms[i]]
+
+    def search(self, query: str) -> np.ndarray:
+        """Returns a boolean row mask of the rows matching the query."""
+        mask = np.zeros(self.size, dtype=bool)
+        for term_id in self.matching_terms(query):
+            mask[self.term_rows[term_id]] = True
+        return mask
+
+
+@dataclasses.dataclass(frozen=True)
+class TableIndexes:
+    """Row indexes built once over a loaded dataset."""
+
+    size: int
+    bitmaps: dict[str, BitmapIndex]
+    dates: DateIndex
+    search: SearchIndex
+    sorts: dict[str, SortIndex]
+
+    def select(self, filters: dict[str, tuple[str, ...]]) -> np.ndarray | None:
+        """Returns the packed bitmap of rows matching every non-empty filter.
+
+        Values of one column are OR-ed, columns are AND-ed. Returns None when
+        no filter is active, meaning every row is selected.
+        """
+        bits = None
+        for column, values in filters.items():
+            if not values:
+                continue
+            column_bits = self.bitmaps[column].select(values)
+            bits = column_bits if bits is None else np.bitwise_and(bits, column_bits)
+        return bits
+
+    def rows(self, bits: np.ndarray, within: slice = slice(None)) -> np.ndarray:
+        """Returns the positions of the rows set in a packed bitmap.
+
+        When a row slice is given, only rows inside it are returned.
+        """
+        offset = within.start or 0
+        selected = np.unpackbits(bits, count=self.size)[within]
+        return np.flatnonzero(selected) + offset
+
+
+def build_indexes(frame: pd.DataFrame) -> TableIndexes:
+    """Builds the row indexes of a normalized, date-sorted Superstore frame."""
+    return TableIndexes(
+        size=len(frame),
+        bitmaps={
+            column: BitmapIndex(frame[column])
+            for column in BITMAP_COLUMNS
+            if column in frame.columns
+        },
+        dates=DateIndex(frame["Order Date"]),
+        search=SearchIndex(frame),
+        sorts={
+            column: SortIndex(frame[column])
+            for column in SORT_COLUMNS
+            if column in frame.columns
+        },
+    )
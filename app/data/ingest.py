@@ -0,0 +1,98 @@
+import dataclasses
+import logging
+import numpy as np
+import pandas as pd
+
+DATE_COLUMNS = ["Order Date", "Ship Date"]
+NUMERIC_COLUMNS = ["Sales", "Quantity", "Discount", "Profit"]
+MONEY_COLUMNS = ["Sales", "Profit", "Discount"]
+DERIVED_COLUMNS = ["Order Month", "Order Quarter", "Order Year"]
+# String columns are dictionary-encoded when at most this share is distinct.
+CATEGORICAL_MAX_RATIO = 0.5
+
+
+@dataclasses.dataclass(frozen=True)
+class CompactionReport:
+    """Memory footprint of a frame before and after compaction."""
+
+    bytes_before: int
+    bytes_after: int
+    dtypes: dict[str, tuple[str, str]]
+
+    @property
+    def ratio(self) -> float:
+        return self.bytes_before / self.bytes_after if self.bytes_after else 0.0
+
+
+def normalize_superstore(raw: pd.DataFrame) -> pd.DataFrame:
+    """Returns a typed copy of the raw Superstore table.
+
+    Date columns are parsed to ``datetime64`` once and month/quarter/year
+    buckets are precomputed so aggregations never re-parse strings. Rows are
+    sorted by Order Date so date ranges map to contiguous row slices.
+    """
+    df = raw.copy()
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors="coerce")
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    invalid_dates = int(df["Order Date"].isna().sum())
+    if invalid_dates:
+        logging.warning(f"{invalid_dates} rows have an unparseable Order Date")
+    order_dates = df["Order Date"]
+    df["Order Month"] = order_dates.dt.to_period("M").dt.to_timestamp()
+    df["Order Quarter"] = order_dates.dt.to_period("Q").dt.to_timestamp()
+    df["Order Year"] = order_dates.dt.year.astype("Int16")
+    return df.sort_values("Order Date", kind="stable").reset_index(drop=True)
+
+
+def source_values(values: pd.Series) -> pd.Series:
+    """Returns the source float64 values of a money column, however it is stored.
+
+    ``compact_frame`` only narrows columns whose float32 shortest repr reads
+    back as the source value, so the repr restores it exactly.
+    """
+    if values.dtype == np.float32:
+        return values.astype(str).astype(np.float64)
+    return values
+
+
+def compact_frame(df: pd.DataFrame) -> tuple[pd.DataFrame, CompactionReport]:
+    """Returns a copy of a normalized frame using compact column types.
+
+    Low-cardinality strings become categoricals, money columns become float32
+    when the shortest repr of every value reads back as the source value, and
+    integer columns are downcast to the smallest type that holds them.
+    Aggregations upcast money columns back to float64 before summing.
+    """
+    bytes_before = int(df.memory_usage(index=True, deep=True).sum())
+    compact = df.copy()
+    for column in compact.columns:
+        values = compact[column]
+        if column in MONEY_COLUMNS and pd.api.types.is_float_dtype(values):
+            narrowed = values.astype(np.float32)
+            if narrowed.astype(str).astype(np.float64).equals(values):
+                compact[column] = narrowed
+        elif pd.api.types.is_integer_dtype(values) and not isinstance(
+            values.dtype, pd.api.extensions.ExtensionDtype
+        ):
+            compact[column] = pd.to_numeric(values, downcast="integer")
+        elif pd.api.types.is_string_dtype(values) or values.dtype == object:
+            if values.nunique() <= CATEGORICAL_MAX_RATIO * len(values):
+                compact[column] = values.astype("category")
+    report = CompactionReport(
+        bytes_before=bytes_before,
+        bytes_after=int(compact.memory_usage(index=True, deep=True).sum()),
+        dtypes={
+            column: (str(df[column].dtype), str(compact[column].dtype))
+            for column in df.columns
+            if df[column].dtype != compact[column].dtype
+        },
+    )
+    logging.info(
+        f"Compacted dataset from {report.bytes_before:,} to "
+        f"{report.bytes_after:,} bytes ({report.ratio:.1f}x)"
+    )
+    return compact, report
@@ -0,0 +1,295 @@
+import threading
+from typing import Any, TypeVar
+from collections.abc import Callable
+import pandas as pd
+from app.data import views
+from app.data.cache import result_cache
+from app.data.comparison import COMPARISON_MONTHS, kpi_changes
+from app.data.cube import CUBE_DIMENSIONS, CUBE_MEASURES, CubeSlice
+from app.data.encoding import encode_records
+from app.data.filters import (
+    FilterSignature,
+    filtered_frame,
+    selected_rows,
+    sliced_cube,
+)
+from app.data.rollups import TREND_CHARTS, kpi_sparkline, trend_charts
+from app.data.store import Dataset, dataset_store
+
+T = TypeVar("T")
+
+# State field -> (view, value when nothing matches the filters).
+CHART_VIEWS: dict[str, tuple[Callable[[CubeSlice], Any], Any]] = {
+    "total_sales": (views.total_sales, 0.0),
+    "total_orders": (views.total_orders, 0),
+    "total_profit": (views.total_profit, 0.0),
+    "sales_vs_profit_trend": (views.sales_vs_profit_trend, []),
+    "category_sales_overtime": (views.category_sales_overtime, []),
+    "quantity_profit_scatter": (views.quantity_profit_scatter, []),
+    "regional_category_heatmap": (views.regional_category_heatmap, []),
+    "order_volume_metrics": (views.order_volume_metrics, []),
+    "category_performance": (views.category_performance, []),
+    "regional_sales": (views.regional_sales, []),
+    "top_products": (views.top_products, []),
+    "profit_by_category": (views.profit_by_category, []),
+}
+
+# Views of the quantity_profit_scatter chart, by scatter mode.
+SCATTER_VIEWS: dict[str, Callable[[CubeSlice], Any]] = {
+    "top": views.quantity_profit_scatter,
+    "density": views.quantity_profit_density,
+}
+
+# Charts sent to the browser in columnar form when requested; the KPIs are
+# scalars and the top products feed a table.
+COLUMNAR_CHARTS = frozenset(
+    {
+        "sales_vs_profit_trend",
+        "category_sales_overtime",
+        "quantity_profit_scatter",
+        "regional_category_heatmap",
+        "order_volume_metrics",
+        "category_performance",
+        "regional_sales",
+        "profit_by_category",
+        "kpi_sparkline",
+    }
+)
+
+# Cancellation flag of the job running on the current pool thread, if any.
+_running = threading.local()
+# Set in worker processes, which build their own copy of each dataset.
+_worker_builders: dict[str, Callable[[], dict]] = {}
+# Version of the parent process dataset each worker copy was built for.
+_worker_versions: dict[str, int] = {}
+_worker_lock = threading.Lock()
+
+
+class JobCancelled(Exception):
+    """Raised when a job is superseded before it finishes."""
+
+
+def run_cancellable(
+    cancelled: threading.Event | None, job: Callable[..., T], *args: Any
+) -> T:
+    """Runs ``job(*args)``; ``check_cancelled`` stops it once ``cancelled`` is set."""
+    _running.cancelled = cancelled
+    try:
+        return job(*args)
+    finally:
+        _running.cancelled = None
+
+
+def check_cancelled():
+    """Raises ``JobCancelled`` if the job running on this thread was superseded."""
+    cancelled = getattr(_running, "cancelled", None)
+    if cancelled is not None and cancelled.is_set():
+        raise JobCancelled()
+
+
+def init_worker(builders: dict[str, Callable[[], dict]]):
+    """Initializes a pool worker process with the builders of each dataset."""
+    _worker_builders.update(builders)
+
+
+def resolve_dataset(dataset_id: str, version: int) -> Dataset | None:
+    """Returns the dataset a job was submitted for.
+
+    Jobs run in threads share the published dataset. Worker processes build
+    their own copy the first time a job needs it, and rebuild it when the
+    parent process has published a newer version since.
+    """
+    if dataset_id not in _worker_builders:
+        return dataset_store.get(dataset_id)
+    with _worker_lock:
+        dataset = dataset_store.get(dataset_id)
+        if dataset is None or _worker_versions.get(dataset_id, 0) < version:
+            dataset = dataset_store.publish(
+                dataset_id, **_worker_builders[dataset_id]()
+            )
+            _worker_versions[dataset_id] = version
+        return dataset
+
+
+def cube_result(
+    dataset: Dataset,
+    signature: FilterSignature,
+    view_fn: Callable[[CubeSlice], T],
+    default: T,
+) -> T:
+    """Returns a view of the filtered cube, shared by sessions with the same filters."""
+
+    def compute() -> T:
+        view = sliced_cube(dataset, signature)
+        if view is None or view.empty:
+            return default
+        return view_fn(view)
+
+    return result_cache.get_or_compute(
+        (dataset.dataset_id, dataset.version, view_fn.__name__, signature),
+        compute,
+    )
+
+
+def trend_result(
+    dataset: Dataset, signature: FilterSignature, months: int | None
+) -> dict[str, Any]:
+    """Returns the trend charts of one set of filters, read from the daily rollup.
+
+    With ``months``, the charts are compared with the window ``months``
+    earlier, as computed by ``trend_charts``.
+    """
+    signature = signature._replace(search="")
+    return result_cache.get_or_compute(
+        (dataset.dataset_id, dataset.version, "trend_charts", signature, months),
+        lambda: trend_charts(
+            dataset.rollup,
+            signature.start,
+            signature.end,
+            signature.categories,
+            signature.regions,
+            months,
+        ),
+    )
+
+
+def sparkline_result(
+    dataset: Dataset, signature: FilterSignature
+) -> list[dict[str, str | float | int]]:
+    """Returns the KPI sparkline of one set of filters, read from the daily rollup."""
+    if dataset.rollup is None:
+        return []
+    signature = signature._replace(search="")
+    return result_cache.get_or_compute(
+        (dataset.dataset_id, dataset.version, "kpi_sparkline", signature),
+        lambda: kpi_sparkline(
+            dataset.rollup,
+            signature.start,
+            signature.end,
+            signature.categories,
+            signature.regions,
+        ),
+    )
+
+
+def chart_views(
+    dataset_id: str,
+    version: int,
+    signature: FilterSignature,
+    columnar: bool = False,
+    scatter: str = "top",
+    comparison: str = "none",
+) -> dict[str, Any]:
+    """Computes every chart and KPI of the dashboard for one set of filters.
+
+    ``scatter`` picks the view of the quantity/profit scatter from
+    ``SCATTER_VIEWS``. The ``TREND_CHARTS`` are bucketed at the granularity
+    returned as "trend_granularity". A ``comparison`` from ``COMPARISON_MONTHS``
+    adds the prior window to them and the change of each KPI as
+    "kpi_changes"; without a date range, "kpi_changes_latest" marks that it
+    compares the latest ``months`` of orders with those before. The recent
+    periods of every KPI come as "kpi_sparkline". With ``columnar``, the charts
+    in ``COLUMNAR_CHARTS`` are returned encoded by ``encode_records``.
+    """
+    dataset = resolve_dataset(dataset_id, version)
+    selected = CHART_VIEWS | {"quantity_profit_scatter": (SCATTER_VIEWS[scatter], [])}
+    months = COMPARISON_MONTHS.get(comparison)
+    trends = None
+    if dataset is not None and dataset.rollup is not None:
+        trends = trend_result(dataset, signature, months)
+    results = {}
+    for name, (view_fn, default) in selected.items():
+        check_cancelled()
+        if dataset is None:
+            results[name] = default
+        elif trends is not None and name in TREND_CHARTS:
+            results[name] = trends[name]
+        else:
+            results[name] = cube_result(dataset, signature, view_fn, default)
+        if columnar and name in COLUMNAR_CHARTS:
+            results[name] = encode_records(results[name])
+    results["trend_granularity"] = trends["trend_granularity"] if trends else "month"
+    windows = trends["kpi_windows"] if trends is not None else None
+    results["kpi_changes"] = kpi_changes(**windows) if windows is not None else {}
+    results["kpi_changes_latest"] = not (signature.start and signature.end)
+    check_cancelled()
+    results["kpi_sparkline"] = (
+        sparkline_result(dataset, signature) if dataset is not None else []
+    )
+    if columnar:
+        results["kpi_sparkline"] = encode_records(results["kpi_sparkline"])
+    return results
+
+
+def table_view(
+    dataset_id: str,
+    version: int,
+    signature: FilterSignature,
+    sort_column: str,
+    sort_direction: str,
+    page: int,
+    per_page: int,
+) -> dict[str, Any]:
+    """Computes one page of the orders table and the number of matching rows."""
+    dataset = resolve_dataset(dataset_id, version)
+    if dataset is None:
+        return {"filtered_table_data": [], "total_filtered_rows": 0}
+    params = (sort_column, sort_direction, page, per_page)
+    return result_cache.get_or_compute(
+        (dataset.dataset_id, dataset.version, "table_page", signature, *params),
+        lambda: views.table_page(dataset, selected_rows(dataset, signature), *params),
+    )
+
+
+def heatmap_dimensions(dataset: Dataset) -> list[str]:
+    """Returns the columns of a dataset that a heatmap can be drawn over."""
+    return [
+        column
+        for column, dtype in dataset.frame.dtypes.items()
+        if isinstance(dtype, pd.CategoricalDtype) and column != "Order ID"
+    ]
+
+
+def heatmap_view(
+    dataset_id: str,
+    version: int,
+    signature: FilterSignature,
+    rows: str,
+    columns: str,
+    measure: str,
+) -> list[dict[str, str | float | int]]:
+    """Computes the heatmap of ``measure`` over two dimensions for one set of filters.
+
+    Pairs of cube dimensions are summed from the filtered cube, any other pair
+    of ``heatmap_dimensions`` from the filtered rows.
+    """
+    if rows == columns or measure not in CUBE_MEASURES:
+        raise ValueError(f"Cannot draw a heatmap of {measure} by {rows} x {columns}")
+    dataset = resolve_dataset(dataset_id, version)
+    if dataset is None:
+        return []
+    signature = signature._replace(search="")
+
+    def compute() -> list[dict[str, str | float | int]]:
+        data = None
+        if {rows, columns} <= set(CUBE_DIMENSIONS):
+            view = sliced_cube(dataset, signature)
+            data = view.cells if view is not None else None
+        if data is None:
+            data = filtered_frame(dataset, signature)
+        if data.empty:
+            return []
+        return views.dimension_heatmap(data, rows, columns, measure)
+
+    return result_cache.get_or_compute(
+        (
+            dataset.dataset_id,
+            dataset.version,
+            "dimension_heatmap",
+            signature,
+            rows,
+            columns,
+            measure,
+        ),
+        compute,
+    )
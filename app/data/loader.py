@@ -0,0 +1,227 @@
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+import pathlib
+import time
+from collections.abc import Callable
+import pandas as pd
+from app.data.cube import build_cube
+from app.data.indexes import build_indexes
+from app.data.rollups import build_rollup
+from app.data.ingest import CompactionReport, compact_frame, normalize_superstore
+from app.data.sources import DataSource
+from app.data.store import Dataset, DatasetStore
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Bump whenever normalize_superstore/compact_frame change their output.
+INGEST_VERSION = 2
+REPORT_METADATA_KEY = b"compaction_report"
+
+
+def prepare_superstore(
+    raw: pd.DataFrame,
+) -> tuple[pd.DataFrame, CompactionReport]:
+    """Runs the raw Superstore table through normalization and compaction."""
+    return compact_frame(normalize_superstore(raw))
+
+
+def _cache_path(cache_dir: str, checksum: str) -> pathlib.Path:
+    return pathlib.Path(cache_dir) / f"superstore-v{INGEST_VERSION}-{checksum}.arrow"
+
+
+def _write_cache(path: pathlib.Path, frame: pd.DataFrame, report: CompactionReport):
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[REPORT_METADATA_KEY] = json.dumps(dataclasses.asdict(report)).encode()
+    table = table.replace_schema_metadata(metadata)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(f".{os.getpid()}.tmp")
+    with (
+        pa.OSFile(str(partial), "wb") as sink,
+        pa.ipc.new_file(sink, table.schema) as writer,
+    ):
+        writer.write_table(table)
+    partial.replace(path)
+
+
+def _read_cache(path: pathlib.Path) -> tuple[pd.DataFrame, CompactionReport | None]:
+    with pa.memory_map(str(path), "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    report = None
+    raw_report = (table.schema.metadata or {}).get(REPORT_METADATA_KEY)
+    if raw_report:
+        fields = json.loads(raw_report)
+        fields["dtypes"] = {k: tuple(v) for k, v in fields["dtypes"].items()}
+        report = CompactionReport(**fields)
+    return table.to_pandas(), report
+
+
+def _latest_cache(cache_dir: str) -> pathlib.Path | None:
+    paths = pathlib.Path(cache_dir).glob(f"superstore-v{INGEST_VERSION}-*.arrow")
+    return max(paths, key=lambda path: path.stat().st_mtime, default=None)
+
+
+def load_superstore(
+    source: DataSource, cache_dir: str | None, data: bytes | None = None
+) -> tuple[pd.DataFrame, CompactionReport | None]:
+    """Loads the prepared Superstore table, reusing the on-disk cache.
+
+    Prepared frames are cached as uncompressed Arrow IPC files keyed by the
+    checksum of the source, so a source is only parsed again after it
+    changes. ``data`` holds the source contents when the caller already read
+    them. When a remote source cannot be downloaded, the newest cached table
+    is served instead. Without pyarrow the cache is skipped and the source is
+    parsed on every load.
+    """
+    if not cache_dir or pa is None:
+        if cache_dir:
+            logging.warning("pyarrow is not installed; the dataset cache is disabled")
+        return prepare_superstore(
+            source.parse(data if data is not None else source.read_bytes())
+        )
+    try:
+        if data is None and source.is_remote:
+            data = source.read_bytes()
+    except OSError as e:
+        cached = _latest_cache(cache_dir)
+        if cached is None:
+            raise
+        logging.warning(
+            f"Error downloading {source.location}: {e}; serving cached {cached.name}"
+        )
+        return _read_cache(cached)
+    path = _cache_path(cache_dir, source.checksum(data))
+    if path.exists():
+        try:
+            return _read_cache(path)
+        except Exception as e:
+            logging.exception(f"Error reading dataset cache {path}: {e}")
+    frame, report = prepare_superstore(
+        source.parse(data if data is not None else source.read_bytes())
+    )
+    try:
+        _write_cache(path, frame, report)
+    except Exception as e:
+        logging.exception(f"Error writing dataset cache {path}: {e}")
+    return frame, report
+
+
+class DatasetLoader:
+    """Loads a dataset at most once at a time per process and keeps it fresh.
+
+    Every caller of ``get`` shares one in-flight load, so a burst of first page
+    visits triggers a single download and parse. Once published, the dataset is
+    served from the store; after ``max_age`` seconds the next caller starts a
+    background reload and keeps the current version until the new one is
+    published. A ``max_age`` of zero or less disables refreshes. With
+    ``fetch``, each load reads the source once and passes its contents to
+    ``build`` (None when the read failed before anything was published, so the
+    build can fall back to a cached table). With a ``checksum`` of those
+    contents too, a reload that finds the source unchanged keeps the published
+    version instead of building and publishing it again.
+    """
+
+    def __init__(
+        self,
+        store: DatasetStore,
+        dataset_id: str,
+        build: Callable[[bytes | None], dict],
+        max_age: float = 0,
+        fetch: Callable[[], bytes] | None = None,
+        checksum: Callable[[bytes], str] | None = None,
+    ):
+        self.store = store
+        self.dataset_id = dataset_id
+        self.build = build
+        self.max_age = max_age
+        self.fetch = fetch
+        self.checksum = checksum
+        self.loaded_at: float | None = None
+        # Checksum of the source the published dataset was built from.
+        self.source_checksum: str | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def is_stale(self) -> bool:
+        """Whether the published dataset is older than the refresh policy allows."""
+        if self.max_age <= 0 or self.loaded_at is None:
+            return False
+        return time.monotonic() - self.loaded_at >= self.max_age
+
+    async def get(self) -> Dataset:
+        """Returns the published dataset, waiting for the first load if needed."""
+        dataset = self.store.get(self.dataset_id)
+        if dataset is None:
+            return await asyncio.shield(self._start())
+        if self.is_stale:
+            self._start()
+        return dataset
+
+    async def refresh(self) -> Dataset:
+        """Reloads the dataset, joining a reload that is already running."""
+        return await asyncio.shield(self._start())
+
+    def _start(self) -> asyncio.Task:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._load())
+            self._task.add_done_callback(self._finished)
+        return self._task
+
+    def _finished(self, task: asyncio.Task):
+        self._task = None
+        if not task.cancelled() and task.exception() is not None:
+            e = task.exception()
+            logging.error(f"Error loading dataset {self.dataset_id}: {e}")
+
+    async def _load(self) -> Dataset:
+        started = time.monotonic()
+        current = self.store.get(self.dataset_id)
+        data = checksum = None
+        if self.fetch is not None:
+            try:
+                data = await asyncio.to_thread(self.fetch)
+            except OSError as e:
+                if current is None:
+                    # The build may still serve a cached table.
+                    logging.warning(f"Error reading {self.dataset_id}: {e}")
+                else:
+                    logging.warning(
+                        f"Error checking {self.dataset_id} for changes: {e}"
+                    )
+                    self.loaded_at = started
+                    return current
+        if data is not None and self.checksum is not None:
+            checksum = await asyncio.to_thread(self.checksum, data)
+            if current is not None and checksum == self.source_checksum:
+                self.loaded_at = started
+                logging.info(f"Dataset {self.dataset_id} v{current.version} unchanged")
+                return current
+        parts = await asyncio.to_thread(self.build, data)
+        dataset = self.store.publish(self.dataset_id, **parts)
+        self.loaded_at = started
+        self.source_checksum = checksum
+        logging.info(
+            f"Loaded dataset {self.dataset_id} v{dataset.version} "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return dataset
+
+
+def build_superstore(
+    source: DataSource, cache_dir: str | None, data: bytes | None = None
+) -> dict:
+    """Loads the Superstore table and builds the structures published with it."""
+    frame, report = load_superstore(source, cache_dir, data)
+    return {
+        "frame": frame,
+        "cube": build_cube(frame),
+        "indexes": build_indexes(frame),
+        "compaction": report,
+        "rollup": build_rollup(frame),
+    }
@@ -0,0 +1,331 @@
+import dataclasses
+from typing import Any
+import numpy as np
+import pandas as pd
+from app.data.comparison import shift_dates
+from app.data.cube import aggregate_orders, pair_mask, region_category_pairs
+
+# Points of each KPI sparkline. Each point totals one week, or one day when the
+# date range is shorter than that many weeks.
+SPARKLINE_POINTS = 12
+WEEK_DAYS = 7
+# Bucket sizes of the trend charts from finest to coarsest, as the pandas
+# period frequency and label format of each. Weeks are labelled by their Sunday.
+GRANULARITIES = {
+    "day": ("D", "%b %d"),
+    "week": ("W-SUN", "%b %d"),
+    "month": ("M", "%b %y"),
+    "quarter": ("Q", "Q%q %y"),
+    "year": ("Y", "%Y"),
+}
+# Most buckets a trend chart shows; date ranges get the finest granularity
+# that fits.
+TREND_MAX_POINTS = 60
+# Charts built by trend_charts.
+TREND_CHARTS = (
+    "sales_vs_profit_trend",
+    "category_sales_overtime",
+    "order_volume_metrics",
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class DailyRollup:
+    """Running totals of the KPIs per day, built once when a dataset is loaded.
+
+    ``totals`` holds the cumulative Sales and Profit up to each day of every
+    (Region, Category) pair, plus a last row for rows without one. ``orders``
+    holds the cumulative order count of every pair bitmask in ``masks``. The
+    total of any run of days is then one subtraction.
+    """
+
+    first_day: pd.Timestamp
+    pairs: list[tuple[str, str]]
+    totals: np.ndarray
+    masks: np.ndarray
+    orders: np.ndarray
+
+    @property
+    def days(self) -> int:
+        return self.totals.shape[1] - 1
+
+
+def _running(codes: np.ndarray, weights: np.ndarray, rows: int, days: int):
+    daily = np.bincount(codes, weights=weights, minlength=rows * days)
+    running = np.zeros((rows, days + 1))
+    np.cumsum(daily.reshape(rows, days), axis=1, out=running[:, 1:])
+    return running
+
+
+def build_rollup(frame: pd.DataFrame) -> DailyRollup | None:
+    """Builds the daily KPI rollup of a normalized Superstore frame."""
+    frame = frame[frame["Order Date"].notna()]
+    if frame.empty:
+        return None
+    dates = frame["Order Date"].dt.normalize()
+    first_day = dates.min()
+    day = ((dates - first_day) // pd.Timedelta(days=1)).to_numpy()
+    days = int(day.max()) + 1
+    pairs = region_category_pairs(frame)
+    pair = pd.MultiIndex.from_tuples(pairs, names=["Region", "Category"]).get_indexer(
+        pd.MultiIndex.from_frame(frame[["Region", "Category"]])
+    )
+    cells = np.where(pair >= 0, pair, len(pairs)) * days + day
+    totals = np.stack(
+        [
+            _running(cells, frame[column].to_numpy("float64"), len(pairs) + 1, days)
+            for column in ("Sales", "Profit")
+        ],
+        axis=-1,
+    )
+    orders = aggregate_orders(
+        pd.DataFrame(
+            {
+                "Order ID": frame["Order ID"].to_numpy(),
+                "Region": frame["Region"].to_numpy(),
+                "Category": frame["Category"].to_numpy(),
+                "Order Day": day,
+            }
+        ),
+        pairs,
+        "Order Day",
+    )
+    masks, mask_codes = np.unique(orders["Pair Mask"].to_numpy(), return_inverse=True)
+    return DailyRollup(
+        first_day=first_day,
+        pairs=pairs,
+        totals=totals,
+        masks=masks,
+        orders=_running(
+            mask_codes * days + orders["Order Day"].to_numpy(),
+            orders["Orders"].to_numpy("float64"),
+            len(masks),
+            days,
+        ),
+    )
+
+
+def _window(rollup: DailyRollup, start: str, end: str) -> tuple[int, int]:
+    # The days of a date range as offsets into the running totals, end excluded.
+    if not (start and end):
+        return 0, rollup.days
+    low = (pd.Timestamp(start).normalize() - rollup.first_day).days
+    high = (pd.Timestamp(end).normalize() - rollup.first_day).days + 1
+    return tuple(int(day) for day in np.clip([low, high], 0, rollup.days))
+
+
+def _offsets(
+    rollup: DailyRollup, dates: pd.DatetimeIndex, after: int = 0
+) -> np.ndarray:
+    # The rows of the running totals up to each date, or after with ``after=1``.
+    days = dates.to_numpy("datetime64[D]") - np.datetime64(rollup.first_day, "D")
+    return np.clip(days.astype("int64") + after, 0, rollup.days)
+
+
+def _selected(
+    rollup: DailyRollup, categories: tuple[str, ...], regions: tuple[str, ...]
+) -> tuple[np.ndarray, np.ndarray]:
+    # The rows of ``totals`` and of ``orders`` matching the filters.
+    pairs = np.ones(len(rollup.pairs) + 1, dtype=bool)
+    masks = np.ones(len(rollup.masks), dtype=bool)
+    if categories or regions:
+        pairs[:-1] = [
+            (not regions or region in regions)
+            and (not categories or category in categories)
+            for region, category in rollup.pairs
+        ]
+        pairs[-1] = False
+        masks = (rollup.masks & pair_mask(rollup.pairs, categories, regions)) != 0
+    return pairs, masks
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator),
+        where=denominator > 0,
+    ).round(2)
+
+
+def kpi_sparkline(
+    rollup: DailyRollup,
+    start: str,
+    end: str,
+    categories: tuple[str, ...],
+    regions: tuple[str, ...],
+) -> list[dict[str, str | float | int]]:
+    """Returns the KPIs of the last ``SPARKLINE_POINTS`` periods of a date range.
+
+    Without a date range, the periods end with the latest order. The rolling
+    totals of every KPI are differences of the same running totals.
+    """
+    pairs, masks = _selected(rollup, categories, regions)
+    running = np.column_stack(
+        [rollup.totals[pairs].sum(axis=0), rollup.orders[masks].sum(axis=0)]
+    )
+    low, high = _window(rollup, start, end)
+    period = WEEK_DAYS if high - low >= SPARKLINE_POINTS * WEEK_DAYS else 1
+    points = min(SPARKLINE_POINTS, (high - low) // period)
+    if points <= 0:
+        return []
+    ends = high - period * np.arange(points - 1, -1, -1)
+    sales, profit, orders = (running[ends] - running[ends - period]).T
+    margin = _ratio(profit * 100, sales)
+    labels = (rollup.first_day + pd.to_timedelta(ends - 1, unit="D")).strftime("%b %d")
+    return [
+        {
+            "Period": label,
+            "Sales": float(values[0]),
+            "Profit": float(values[1]),
+            "Orders": int(values[2]),
+            "Profit Margin": float(values[3]),
+        }
+        for label, values in zip(
+            labels,
+            np.column_stack([sales.round(2), profit.round(2), orders.round(), margin]),
+        )
+    ]
+
+
+def trend_granularity(first: pd.Timestamp, last: pd.Timestamp) -> str:
+    """Returns the finest granularity splitting a date range into few enough buckets."""
+    for name, (freq, _) in GRANULARITIES.items():
+        if (last.to_period(freq) - first.to_period(freq)).n < TREND_MAX_POINTS:
+            return name
+    return name
+
+
+def _trend_records(
+    labels: list[str], values: np.ndarray, categories: list[str]
+) -> dict[str, list[dict[str, str | float | int]]]:
+    # The records of each trend chart from the Sales, Profit, Orders and
+    # per-category Sales of each bucket.
+    sales, profit, orders = values[:, 0], values[:, 1], values[:, 2].round()
+    rounded = values.round(2).tolist()
+    margins = _ratio(profit * 100, sales).tolist()
+    averages = _ratio(sales, orders).tolist()
+    counts = orders.astype(int).tolist()
+    return {
+        "sales_vs_profit_trend": [
+            {
+                "Order Date": label,
+                "Sales": row[0],
+                "Profit": row[1],
+                "Order ID": count,
+                "Profit Margin": margin,
+            }
+            for label, row, count, margin in zip(labels, rounded, counts, margins)
+        ],
+        "category_sales_overtime": [
+            {"Order Date": label} | dict(zip(categories, row[3:]))
+            for label, row in zip(labels, rounded)
+        ],
+        "order_volume_metrics": [
+            {
+                "Order Date": label,
+                "Order Count": count,
+                "Sales": row[0],
+                "Average Order Value": average,
+            }
+            for label, row, count, average in zip(labels, rounded, counts, averages)
+        ],
+    }
+
+
+def _window_totals(
+    rollup: DailyRollup, running: np.ndarray, window: pd.DatetimeIndex
+) -> dict[str, float]:
+    """Returns the sales, profit and orders between the two days of ``window``."""
+    first, last = _offsets(rollup, window[:1]), _offsets(rollup, window[1:], 1)
+    sales, profit, orders = (running[last] - running[first])[0, :3]
+    return {
+        "total_sales": float(sales),
+        "total_profit": float(profit),
+        "total_orders": round(float(orders)),
+    }
+
+
+def trend_charts(
+    rollup: DailyRollup,
+    start: str,
+    end: str,
+    categories: tuple[str, ...],
+    regions: tuple[str, ...],
+    months: int | None = None,
+) -> dict[str, Any]:
+    """Returns the trend charts of a date range, bucketed by ``trend_granularity``.
+
+    Every bucket of every chart is the difference of the running totals at its
+    edges, so any granularity costs the same. Buckets without orders are left
+    out. With ``months``, each measure gets a "Prior ..." value over the same
+    buckets ``months`` earlier (None when those have no orders), and
+    "kpi_windows" holds the totals compared by the KPI cards: the date range
+    and the same window ``months`` earlier, or, without a date range, the
+    latest ``months`` of orders and the ``months`` before them.
+    """
+    if start and end:
+        first, last = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+    else:
+        first = rollup.first_day
+        last = rollup.first_day + pd.Timedelta(days=rollup.days - 1)
+    if last < first:
+        return {name: [] for name in TREND_CHARTS} | {
+            "trend_granularity": "month",
+            "kpi_windows": None,
+        }
+    granularity = trend_granularity(first, last)
+    freq, label_format = GRANULARITIES[granularity]
+    periods = pd.period_range(first, last, freq=freq)
+    # First and last day of each bucket, cut to the date range.
+    starts = periods.start_time.where(periods.start_time > first, first)
+    ends = periods.end_time.normalize()
+    ends = ends.where(ends < last, last)
+    pairs, masks = _selected(rollup, categories, regions)
+    pair_categories = np.array(
+        [category for _, category in rollup.pairs] + [None], dtype=object
+    )
+    names = sorted(set(pair_categories[:-1][pairs[:-1]]))
+    running = np.column_stack(
+        [
+            rollup.totals[pairs].sum(axis=0),
+            rollup.orders[masks].sum(axis=0),
+            *[
+                rollup.totals[pairs & (pair_categories == name), :, 0].sum(axis=0)
+                for name in names
+            ],
+        ]
+    )
+    labels = periods.strftime(label_format).tolist()
+    # Every measure of every bucket in one step.
+    values = running[_offsets(rollup, ends, 1)] - running[_offsets(rollup, starts)]
+    records = _trend_records(labels, values, names)
+    kept = np.flatnonzero(values[:, 2].round() > 0)
+    charts = {name: [records[name][i] for i in kept] for name in TREND_CHARTS}
+    kpi_windows = None
+    if months is not None:
+        prior = (
+            running[_offsets(rollup, shift_dates(ends, months), 1)]
+            - running[_offsets(rollup, shift_dates(starts, months))]
+        )
+        priors = _trend_records(labels, prior, names)
+        had_orders = prior[:, 2].round() > 0
+        for name in TREND_CHARTS:
+            charts[name] = [
+                records[name][i]
+                | {
+                    f"Prior {key}": priors[name][i][key] if had_orders[i] else None
+                    for key, value in records[name][i].items()
+                    if isinstance(value, (int, float))
+                }
+                for i in kept
+            ]
+        if not (start and end):
+            # All-time totals have no prior window; compare the latest months.
+            first = last - pd.DateOffset(months=months) + pd.Timedelta(days=1)
+        window = pd.DatetimeIndex([first, last])
+        kpi_windows = {
+            "current": _window_totals(rollup, running, window),
+            "prior": _window_totals(rollup, running, shift_dates(window, months)),
+        }
+    return charts | {"trend_granularity": granularity, "kpi_windows": kpi_windows}
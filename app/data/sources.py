@@ -0,0 +1,91 @@
+import abc
+import hashlib
+import io
+import pathlib
+import urllib.parse
+import urllib.request
+import pandas as pd
+
+CHUNK_BYTES = 1 << 20
+# Seconds a download may wait on the remote host before failing.
+DOWNLOAD_TIMEOUT = 30.0
+
+
+class DataSource(abc.ABC):
+    """A location the Superstore table can be read from."""
+
+    def __init__(self, location: str, timeout: float = DOWNLOAD_TIMEOUT):
+        self.location = location
+        self.timeout = timeout
+
+    @property
+    def is_remote(self) -> bool:
+        return urllib.parse.urlparse(self.location).scheme in ("http", "https")
+
+    def read_bytes(self) -> bytes:
+        """Returns the raw contents of the source."""
+        if self.is_remote:
+            with urllib.request.urlopen(
+                self.location, timeout=self.timeout
+            ) as response:
+                return response.read()
+        return pathlib.Path(self.location).read_bytes()
+
+    def checksum(self, data: bytes | None = None) -> str:
+        """Returns the sha256 of the source contents."""
+        digest = hashlib.sha256()
+        if data is not None:
+            digest.update(data)
+        elif self.is_remote:
+            digest.update(self.read_bytes())
+        else:
+            with open(self.location, "rb") as source:
+                while chunk := source.read(CHUNK_BYTES):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    @abc.abstractmethod
+    def parse(self, data: bytes) -> pd.DataFrame:
+        """Parses the raw contents of the source into a frame."""
+
+
+class CsvSource(DataSource):
+    """A CSV file or URL."""
+
+    def __init__(
+        self,
+        location: str,
+        encoding: str = "latin1",
+        timeout: float = DOWNLOAD_TIMEOUT,
+    ):
+        super().__init__(location, timeout)
+        self.encoding = encoding
+
+    def parse(self, data: bytes) -> pd.DataFrame:
+        return pd.read_csv(io.BytesIO(data), encoding=self.encoding)
+
+
+class ParquetSource(DataSource):
+    """A Parquet file or URL (requires pyarrow)."""
+
+    def parse(self, data: bytes) -> pd.DataFrame:
+        return pd.read_parquet(io.BytesIO(data))
+
+
+class ArrowSource(DataSource):
+    """An Arrow IPC / Feather file or URL (requires pyarrow)."""
+
+    def parse(self, data: bytes) -> pd.DataFrame:
+        return pd.read_feather(io.BytesIO(data))
+
+
+def source_from_location(
+    location: str, timeout: float = DOWNLOAD_TIMEOUT
+) -> DataSource:
+    """Returns the data source matching a path or URL's file extension."""
+    suffix = pathlib.PurePosixPath(urllib.parse.urlparse(location).path).suffix
+    if suffix in (".parquet", ".pq"):
+        return ParquetSource(location, timeout)
+    if suffix in (".arrow", ".feather", ".ipc"):
+        return ArrowSource(location, timeout)
+    return CsvSource(location, timeout=timeout)
@@ -0,0 +1,63 @@
+import threading
+import dataclasses
+import pandas as pd
+from app.data.cache import result_cache
+from app.data.cube import Cube
+from app.data.indexes import TableIndexes
+from app.data.ingest import CompactionReport
+from app.data.rollups import DailyRollup
+
+SUPERSTORE_DATASET = "superstore"
+
+
+@dataclasses.dataclass(frozen=True)
+class Dataset:
+    """A read-only, versioned snapshot of a loaded table shared by all sessions."""
+
+    dataset_id: str
+    version: int
+    frame: pd.DataFrame
+    cube: Cube | None = None
+    indexes: TableIndexes | None = None
+    compaction: CompactionReport | None = None
+    rollup: DailyRollup | None = None
+
+
+class DatasetStore:
+    """Process-wide registry of the latest version of each dataset."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._datasets: dict[str, Dataset] = {}
+
+    def publish(
+        self,
+        dataset_id: str,
+        frame: pd.DataFrame,
+        cube: Cube | None = None,
+        indexes: TableIndexes | None = None,
+        compaction: CompactionReport | None = None,
+        rollup: DailyRollup | None = None,
+    ) -> Dataset:
+        """Store a new version of a dataset, replacing the previous one."""
+        with self._lock:
+            previous = self._datasets.get(dataset_id)
+            dataset = Dataset(
+                dataset_id=dataset_id,
+                version=previous.version + 1 if previous else 1,
+                frame=frame,
+                cube=cube,
+                indexes=indexes,
+                compaction=compaction,
+                rollup=rollup,
+            )
+            self._datasets[dataset_id] = dataset
+        result_cache.invalidate(dataset_id, keep_version=dataset.version)
+        return dataset
+
+    def get(self, dataset_id: str) -> Dataset | None:
+        """Returns the latest version of a dataset, if it has been loaded."""
+        return self._datasets.get(dataset_id)
+
+
+dataset_store = DatasetStore()
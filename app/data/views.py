@@ -0,0 +1,336 @@
+import logging
+from typing import Any
+import numpy as np
+import pandas as pd
+from app.data.cube import MEASURE_DTYPES, CubeSlice
+from app.data.ingest import source_values
+from app.data.store import Dataset
+
+TABLE_COLUMNS = [
+    "Order Date",
+    "Product Name",
+    "Category",
+    "Sales",
+    "Quantity",
+    "Profit",
+    "Customer Name",
+    "Region",
+]
+# Products shown by the quantity/profit scatter, and bins per axis of its
+# density mode.
+SCATTER_TOP_N = 100
+SCATTER_BINS = 32
+
+
+def total_sales(view: CubeSlice) -> float:
+    """Calculates the total sales of a cube slice."""
+    return float(view.cells["Sales"].sum())
+
+
+def total_orders(view: CubeSlice) -> int:
+    """Calculates the number of distinct orders of a cube slice."""
+    return int(view.orders["Orders"].sum())
+
+
+def total_profit(view: CubeSlice) -> float:
+    """Calculates the total profit of a cube slice."""
+    return float(view.cells["Profit"].sum())
+
+
+def sales_vs_profit_trend(view: CubeSlice) -> list[dict[str, str | float | int]]:
+    """Multi-line chart with Sales and Profit trends over time."""
+    try:
+        monthly_data = view.cells.groupby("Order Month")[["Sales", "Profit"]].sum()
+        monthly_data["Order ID"] = (
+            view.orders.groupby("Order Month")["Orders"].sum().astype(int)
+        )
+        monthly_data = monthly_data.reset_index().rename(
+            columns={"Order Month": "Order Date"}
+        )
+        monthly_data["Order Date"] = monthly_data["Order Date"].dt.strftime("%b %y")
+        monthly_data["Profit Margin"] = (
+            monthly_data["Profit"] / monthly_data["Sales"] * 100
+        ).round(2)
+        return monthly_data.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing sales vs profit trend: {e}")
+        return []
+
+
+def category_sales_overtime(view: CubeSlice) -> list[dict[str, str | float | int]]:
+    """Stacked area chart showing category contribution over time."""
+    try:
+        pivot_data = (
+            view.cells.groupby(["Order Month", "Category"], observed=True)["Sales"]
+            .sum()
+            .unstack(fill_value=0)
+            .rename_axis(index="Order Date", columns=None)
+            .reset_index()
+        )
+        pivot_data["Order Date"] = pivot_data["Order Date"].dt.strftime("%b %y")
+        return pivot_data.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing category sales over time: {e}")
+        return []
+
+
+def _product_totals(view: CubeSlice) -> pd.DataFrame:
+    """Sums Quantity, Profit and Sales per product of a cube slice."""
+    products = view.cells["Product Name"]
+    if not isinstance(products.dtype, pd.CategoricalDtype):
+        return (
+            view.cells.groupby("Product Name", observed=True)[
+                ["Quantity", "Profit", "Sales"]
+            ]
+            .sum()
+            .reset_index()
+        )
+    # Summing by category code skips the hashing and sorting of a groupby.
+    codes = products.cat.codes.to_numpy()
+    size = len(products.cat.categories)
+    observed = np.bincount(codes, minlength=size) > 0
+    totals = {
+        column: np.bincount(
+            codes, weights=view.cells[column].to_numpy(), minlength=size
+        )[observed]
+        for column in ("Quantity", "Profit", "Sales")
+    }
+    return pd.DataFrame(
+        {
+            "Product Name": products.cat.categories[observed],
+            "Quantity": totals["Quantity"].astype(view.cells["Quantity"].dtype),
+            "Profit": totals["Profit"],
+            "Sales": totals["Sales"],
+        }
+    )
+
+
+def quantity_profit_scatter(view: CubeSlice) -> list[dict[str, str | float | int]]:
+    """Scatter plot with Quantity vs Profit of the top products, sized by Sales."""
+    try:
+        scatter_data = _product_totals(view)
+        sales = scatter_data["Sales"].to_numpy()
+        max_sales = sales.max()
+        min_sales = sales.min()
+        if len(sales) > SCATTER_TOP_N:
+            # Partial selection, in row order so ties rank like nlargest.
+            top = np.argpartition(-sales, SCATTER_TOP_N - 1)[:SCATTER_TOP_N]
+            scatter_data = scatter_data.take(np.sort(top))
+        scatter_data = scatter_data.sort_values("Sales", ascending=False, kind="stable")
+        if max_sales > min_sales:
+            scatter_data["Bubble Size"] = (
+                5 + 45 * (scatter_data["Sales"] - min_sales) / (max_sales - min_sales)
+            ).round(0)
+        else:
+            scatter_data["Bubble Size"] = 25
+        return scatter_data.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing quantity profit scatter: {e}")
+        return []
+
+
+def quantity_profit_density(view: CubeSlice) -> list[dict[str, float | int]]:
+    """Quantity vs Profit of every product, counted on a grid of bins.
+
+    Each non-empty bin is one point at its center, sized by the log of the
+    number of products it holds.
+    """
+    try:
+        products = _product_totals(view)
+        quantity = products["Quantity"].to_numpy(dtype="float64")
+        profit = products["Profit"].to_numpy()
+        counts, quantity_edges, profit_edges = np.histogram2d(
+            quantity, profit, bins=SCATTER_BINS
+        )
+        sales, _, _ = np.histogram2d(
+            quantity,
+            profit,
+            bins=[quantity_edges, profit_edges],
+            weights=products["Sales"].to_numpy(),
+        )
+        rows, columns = np.nonzero(counts)
+        density = pd.DataFrame(
+            {
+                "Quantity": ((quantity_edges[:-1] + quantity_edges[1:]) / 2)[rows],
+                "Profit": ((profit_edges[:-1] + profit_edges[1:]) / 2)[columns],
+                "Products": counts[rows, columns].astype(int),
+                "Sales": sales[rows, columns],
+            }
+        ).round({"Quantity": 1, "Profit": 2, "Sales": 2})
+        scale = np.log1p(density["Products"])
+        density["Bubble Size"] = (5 + 45 * scale / scale.max()).round(0)
+        return density.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing quantity profit density: {e}")
+        return []
+
+
+def dimension_heatmap(
+    data: pd.DataFrame, rows: str, columns: str, measure: str
+) -> list[dict[str, str | float | int]]:
+    """Heatmap data of ``measure`` summed per pair of ``rows`` and ``columns`` values.
+
+    The "Performance Score" min-max scales each total from 0 to 100 among the
+    pairs of the same ``rows`` value, or is 50 when they all have the same total.
+    """
+    try:
+        heatmap_data = (
+            data[measure]
+            .astype(MEASURE_DTYPES[measure])
+            .groupby([data[rows], data[columns]], observed=True)
+            .sum()
+            .reset_index()
+        )
+        totals = heatmap_data.groupby(rows, observed=True)[measure]
+        low = totals.transform("min")
+        spread = totals.transform("max") - low
+        heatmap_data["Performance Score"] = (
+            ((heatmap_data[measure] - low) / spread.where(spread > 0) * 100)
+            .round(1)
+            .fillna(50.0)
+        )
+        return heatmap_data.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing {rows} x {columns} heatmap: {e}")
+        return []
+
+
+def regional_category_heatmap(view: CubeSlice) -> list[dict[str, str | float | int]]:
+    """Heatmap data for Region vs Category performance."""
+    return dimension_heatmap(view.cells, "Region", "Category", "Sales")
+
+
+def order_volume_metrics(view: CubeSlice) -> list[dict[str, str | float | int]]:
+    """Combined chart with Order Volume (bars) and Average Order Value (line)."""
+    try:
+        monthly_orders = pd.DataFrame(
+            {
+                "Order Count": view.orders.groupby("Order Month")["Orders"]
+                .sum()
+                .astype(int),
+                "Sales": view.cells.groupby("Order Month")["Sales"].sum(),
+            }
+        )
+        monthly_orders = monthly_orders.reset_index(names="Order Date")
+        monthly_orders["Order Date"] = monthly_orders["Order Date"].dt.strftime("%b %y")
+        monthly_orders["Average Order Value"] = (
+            monthly_orders["Sales"] / monthly_orders["Order Count"]
+        ).round(2)
+        return monthly_orders.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing order volume metrics: {e}")
+        return []
+
+
+def category_performance(view: CubeSlice) -> list[dict[str, str | float]]:
+    """Calculates sales for each product category."""
+    try:
+        category_sales = (
+            view.cells.groupby("Category", observed=True)["Sales"]
+            .sum()
+            .reset_index()
+            .sort_values(by="Sales", ascending=False)
+        )
+        return category_sales.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing category performance data: {e}")
+        return []
+
+
+def regional_sales(view: CubeSlice) -> list[dict[str, str | float]]:
+    """Calculates total sales per region."""
+    try:
+        regional_data = (
+            view.cells.groupby("Region", observed=True)["Sales"]
+            .sum()
+            .reset_index()
+            .sort_values(by="Sales", ascending=False)
+        )
+        return regional_data.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing regional sales data: {e}")
+        return []
+
+
+def top_products(view: CubeSlice) -> list[dict[str, str | float]]:
+    """Finds the top 10 products by sales."""
+    try:
+        top_prods = (
+            view.cells.groupby("Product Name", observed=True)["Sales"]
+            .sum()
+            .nlargest(10)
+            .reset_index()
+        )
+        return top_prods.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing top products data: {e}")
+        return []
+
+
+def profit_by_category(view: CubeSlice) -> list[dict[str, str | float]]:
+    """Calculates total profit for each product category."""
+    try:
+        profit_data = (
+            view.cells.groupby("Category", observed=True)["Profit"]
+            .sum()
+            .reset_index()
+            .sort_values(by="Profit", ascending=False)
+        )
+        return profit_data.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing profit by category data: {e}")
+        return []
+
+
+def table_page(
+    dataset: Dataset,
+    selected: np.ndarray | None,
+    sort_column: str,
+    sort_direction: str,
+    page: int,
+    per_page: int,
+) -> dict[str, Any]:
+    """Returns one sorted page of the orders table and the number of matching rows.
+
+    Both come from the boolean row mask of the filters: the count is its number
+    of set rows, and the page walks the presorted permutation of the sort
+    column through it, so the matching rows are never copied or sorted.
+    """
+    frame = dataset.frame
+    count = len(frame) if selected is None else int(np.count_nonzero(selected))
+    try:
+        start = (page - 1) * per_page
+        descending = sort_direction != "asc"
+        indexes = dataset.indexes
+        if indexes is not None and sort_column in indexes.sorts:
+            positions = indexes.sorts[sort_column].page(
+                selected, descending, start, start + per_page
+            )
+            df = frame.take(positions)
+        else:
+            rows = frame if selected is None else frame[selected]
+            df = rows.sort_values(by=sort_column, ascending=not descending)
+            df = df.iloc[start : start + per_page]
+        df = df[TABLE_COLUMNS].copy()
+        df["Order Date"] = df["Order Date"].dt.strftime("%Y-%m-%d")
+        for column in ("Sales", "Profit"):
+            df[column] = source_values(df[column])
+        df["Quantity"] = df["Quantity"].astype(int)
+        records = df.to_dict("records")
+    except Exception as e:
+        logging.exception(f"Error processing filtered table data: {e}")
+        records = []
+    return {"filtered_table_data": records, "total_filtered_rows": count}
+
+
+def category_margins(view: CubeSlice) -> list[dict[str, str | float]]:
+    """Calculates sales, profit and profit margin per category of a cube slice."""
+    categories = (
+        view.cells.groupby("Category", observed=True)[["Sales", "Profit"]]
+        .sum()
+        .reset_index()
+    )
+    categories["Profit Margin"] = (
+        categories["Profit"] / categories["Sales"] * 100
+    ).round(2)
+    return categories.to_dict("records")
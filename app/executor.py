@@ -0,0 +1,181 @@
+import asyncio
+import concurrent.futures
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable, Hashable
+from typing import Any, TypeVar
+from app.data.jobs import JobCancelled, run_cancellable
+from app.metrics import metrics
+
+T = TypeVar("T")
+
+metrics.describe(
+    "dashboard_job_seconds",
+    "histogram",
+    "Time an aggregation job spent running on the pool.",
+)
+metrics.describe(
+    "dashboard_job_wait_seconds",
+    "histogram",
+    "Time an aggregation job waited for a free slot in the job queue.",
+)
+metrics.describe(
+    "dashboard_jobs_rejected_total",
+    "counter",
+    "Aggregation jobs rejected because the job queue stayed full.",
+)
+metrics.describe(
+    "dashboard_jobs_cancelled_total",
+    "counter",
+    "Aggregation jobs cancelled because a newer job superseded them.",
+)
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when a job cannot be queued before the queue timeout expires."""
+
+
+class _JobHandle:
+    """Cancellation handle of a submitted job."""
+
+    def __init__(self):
+        self.cancelled = threading.Event()
+        self.future: concurrent.futures.Future | None = None
+
+    def cancel(self):
+        self.cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+
+class AggregationExecutor:
+    """Runs blocking aggregation jobs on a thread or process pool.
+
+    At most ``max_pending`` jobs are queued or running at once. Further jobs
+    wait for a slot without holding a worker, so a burst from one session
+    cannot grow the queue without bound; a job still waiting after
+    ``queue_timeout`` seconds is rejected with ``ExecutorBusy``.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        max_workers: int = 4,
+        max_pending: int = 64,
+        queue_timeout: float = 10.0,
+        initializer: Callable[..., None] | None = None,
+        initargs: tuple = (),
+    ):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown executor kind {kind!r}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.queue_timeout = queue_timeout
+        self.initializer = initializer
+        self.initargs = initargs
+        self.pending = 0
+        self._pool: concurrent.futures.Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._latest: dict[Hashable, _JobHandle] = {}
+
+    def _get_pool(self) -> concurrent.futures.Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                # Forking a process that runs an event loop and threads is unsafe.
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                    initargs=self.initargs,
+                )
+            else:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="aggregation"
+                )
+        return self._pool
+
+    async def run(
+        self, job: Callable[..., T], *args: Any, key: Hashable | None = None
+    ) -> T:
+        """Runs ``job(*args)`` on the pool and returns its result.
+
+        A job submitted with a ``key`` supersedes the previous job with the same
+        key, whose caller gets ``JobCancelled``: it is dropped if still queued,
+        and on thread pools a running job stops at its next checkpoint.
+        """
+        handle = _JobHandle()
+        if key is not None:
+            previous = self._latest.get(key)
+            if previous is not None:
+                previous.cancel()
+            self._latest[key] = handle
+        name = getattr(job, "__name__", "job")
+        try:
+            return await self._run(name, job, args, handle)
+        except JobCancelled:
+            metrics.inc("dashboard_jobs_cancelled_total", {"job": name})
+            raise
+        finally:
+            if key is not None and self._latest.get(key) is handle:
+                del self._latest[key]
+
+    async def _run(
+        self, name: str, job: Callable[..., T], args: tuple, handle: _JobHandle
+    ) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_pending)
+        queued = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except TimeoutError:
+            metrics.inc("dashboard_jobs_rejected_total", {"job": name})
+            raise ExecutorBusy(f"No room in the job queue for {name}") from None
+        self.pending += 1
+        started = time.perf_counter()
+        metrics.observe("dashboard_job_wait_seconds", {"job": name}, started - queued)
+        try:
+            if handle.cancelled.is_set():
+                raise JobCancelled(name)
+            # Events cannot be shared with worker processes, which only stop
+            # superseded jobs that have not started yet.
+            cancelled = handle.cancelled if self.kind == "thread" else None
+            handle.future = self._get_pool().submit(
+                run_cancellable, cancelled, job, *args
+            )
+            try:
+                result = await asyncio.wrap_future(handle.future)
+            except asyncio.CancelledError:
+                if handle.cancelled.is_set():
+                    raise JobCancelled(name) from None
+                raise
+            if handle.cancelled.is_set():
+                raise JobCancelled(name)
+            return result
+        finally:
+            self.pending -= 1
+            self._slots.release()
+            metrics.observe(
+                "dashboard_job_seconds", {"job": name}, time.perf_counter() - started
+            )
+
+    def cancel(self, key: Hashable):
+        """Cancels the latest job submitted with ``key``, if it has not finished."""
+        handle = self._latest.get(key)
+        if handle is not None:
+            handle.cancel()
+
+    def release(self, key: Hashable):
+        """Lets the latest job submitted with ``key`` finish whatever comes next.
+
+        A released job is no longer stopped by ``cancel(key)`` or superseded by
+        the next job with the same key.
+        """
+        self._latest.pop(key, None)
+
+    def shutdown(self):
+        """Stops the pool, letting running jobs finish."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,295 @@
+import bisect
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import threading
+import time
+from typing import Any
+from collections.abc import Callable
+from app import settings
+from app.data.cache import result_cache
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+# The event handler running in this task; the var recomputes for the delta sent
+# after a handler returns happen in the same task and are attributed to it.
+current_event: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_event", default="none"
+)
+# The outermost event handler currently running, if any.
+current_handler: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "current_handler", default=""
+)
+
+
+class Histogram:
+    """Cumulative bucket counts of observed values, as Prometheus exposes them."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            rows.append((str(bound), total))
+        return rows
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}
+        self._counters: dict[tuple[str, tuple], float] = {}
+        self._histograms: dict[tuple[str, tuple], Histogram] = {}
+        self._collected: dict[str, Callable[[], float]] = {}
+
+    def describe(self, name: str, kind: str, text: str):
+        self._help[name] = (kind, text)
+
+    def inc(self, name: str, labels: dict[str, str], amount: float = 1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(
+        self,
+        name: str,
+        labels: dict[str, str],
+        value: float,
+        buckets: tuple[float, ...] = SECONDS_BUCKETS,
+    ):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def collect(self, name: str, kind: str, text: str, read: Callable[[], float]):
+        """Registers a metric whose value is read when the metrics are rendered."""
+        self.describe(name, kind, text)
+        self._collected[name] = read
+
+    def clear(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            series: dict[str, list[str]] = {}
+            for (name, labels), value in self._counters.items():
+                series.setdefault(name, []).append(
+                    f"{name}{_format_labels(labels)} {value:g}"
+                )
+            for (name, labels), histogram in self._histograms.items():
+                rows = series.setdefault(name, [])
+                for bound, count in histogram.cumulative():
+                    bucket_labels = _format_labels((*labels, ("le", bound)))
+                    rows.append(f"{name}_bucket{bucket_labels} {count}")
+                rows.append(f"{name}_sum{_format_labels(labels)} {histogram.sum:g}")
+                rows.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+        for name, read in self._collected.items():
+            series[name] = [f"{name} {read():g}"]
+        for name in sorted(series):
+            kind, text = self._help.get(name, ("untyped", ""))
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.extend(sorted(series[name]))
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for key, value in labels:
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        value = value.replace("\n", "\\n")
+        pairs.append(f'{key}="{value}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+def payload_size(value: Any) -> int:
+    """Returns the size of ``value`` once serialized as JSON for the frontend."""
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+metrics = MetricsRegistry()
+metrics.describe(
+    "dashboard_var_recomputes_total",
+    "counter",
+    "Computed var recomputations, by var and the event that triggered them.",
+)
+metrics.describe(
+    "dashboard_var_seconds", "histogram", "Time spent recomputing a computed var."
+)
+metrics.describe(
+    "dashboard_var_payload_bytes",
+    "histogram",
+    "JSON size of the value a computed var returned.",
+)
+metrics.describe("dashboard_events_total", "counter", "Processed event handlers.")
+metrics.describe(
+    "dashboard_event_seconds", "histogram", "Time spent inside an event handler."
+)
+metrics.describe(
+    "dashboard_event_recompute_seconds_total",
+    "counter",
+    "Time spent recomputing the computed vars invalidated by an event.",
+)
+metrics.describe(
+    "dashboard_event_payload_bytes_total",
+    "counter",
+    "JSON size of the computed var values sent to the browser after an event.",
+)
+metrics.collect(
+    "dashboard_result_cache_hits_total",
+    "counter",
+    "Aggregation results served from the result cache.",
+    lambda: result_cache.hits,
+)
+metrics.collect(
+    "dashboard_result_cache_misses_total",
+    "counter",
+    "Aggregation results computed because they were not cached.",
+    lambda: result_cache.misses,
+)
+metrics.collect(
+    "dashboard_result_cache_bytes",
+    "gauge",
+    "Estimated size of the cached aggregation results.",
+    lambda: result_cache.size_bytes,
+)
+
+
+def observe_var(name: str, seconds: float, value: Any):
+    """Records one recomputation of a computed var."""
+    event = current_event.get()
+    size = payload_size(value)
+    metrics.inc("dashboard_var_recomputes_total", {"var": name, "event": event})
+    metrics.observe("dashboard_var_seconds", {"var": name}, seconds)
+    metrics.observe(
+        "dashboard_var_payload_bytes", {"var": name}, size, buckets=BYTES_BUCKETS
+    )
+    metrics.inc("dashboard_event_recompute_seconds_total", {"event": event}, seconds)
+    metrics.inc("dashboard_event_payload_bytes_total", {"event": event}, size)
+    if settings.METRICS_DEBUG_LOG:
+        logging.info(
+            f"var {name} recomputed in {seconds * 1000:.1f}ms, {size} bytes"
+            f" (event: {event})"
+        )
+
+
+def observe_event(name: str, seconds: float):
+    """Records one run of an event handler."""
+    metrics.inc("dashboard_events_total", {"event": name})
+    metrics.observe("dashboard_event_seconds", {"event": name}, seconds)
+    if settings.METRICS_DEBUG_LOG:
+        logging.info(f"event {name} handled in {seconds * 1000:.1f}ms")
+
+
+class _TimedGetter:
+    """Wraps a computed var getter to time each recomputation.
+
+    Reflex reads a var's dependencies from the bytecode of its getter and
+    unwraps ``.func`` like it does for ``functools.partial``, so exposing the
+    original getter there keeps dependency tracking unchanged.
+    """
+
+    def __init__(self, func: Callable):
+        functools.update_wrapper(self, func)
+        self.func = func
+
+    def __call__(self, state: Any) -> Any:
+        started = time.perf_counter()
+        value = self.func(state)
+        observe_var(self.__name__, time.perf_counter() - started, value)
+        return value
+
+
+def timed_var(fn: Callable) -> Callable:
+    """Decorates a computed var getter, under ``@rx.var``, to record its recomputes."""
+    if not settings.METRICS_ENABLED:
+        return fn
+    return _TimedGetter(fn)
+
+
+@contextlib.contextmanager
+def _handling(name: str):
+    # Handlers calling other handlers directly count as part of the outer event.
+    if current_handler.get():
+        yield
+        return
+    current_event.set(name)
+    token = current_handler.set(name)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        with contextlib.suppress(ValueError):
+            # Generators closed from another context cannot reset the token.
+            current_handler.reset(token)
+        observe_event(name, time.perf_counter() - started)
+
+
+def timed_event(fn: Callable) -> Callable:
+    """Decorates an event handler, under ``@rx.event``, to record its runs.
+
+    The handler name is kept as the current event for the rest of the task, so
+    the var recomputes for the delta that follows are attributed to it.
+    """
+    if not settings.METRICS_ENABLED:
+        return fn
+    name = fn.__name__
+
+    if inspect.isasyncgenfunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with _handling(name):
+                async for update in fn(*args, **kwargs):
+                    yield update
+
+    elif inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with _handling(name):
+                return await fn(*args, **kwargs)
+
+    elif inspect.isgeneratorfunction(fn):
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _handling(name):
+                yield from fn(*args, **kwargs)
+
+    else:
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _handling(name):
+                return fn(*args, **kwargs)
+
+    return wrapper
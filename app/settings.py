@@ -0,0 +1,43 @@
+import os
+import secrets
+
+DEFAULT_DATA_SOURCE = "https://raw.githubusercontent.com/atharvayeola/superstore-analytics-pipeline/main/superstore.csv"
+
+# Local CSV/Parquet/Arrow file path or URL of the Superstore extract.
+DATA_SOURCE = os.environ.get("SUPERSTORE_DATA_SOURCE", DEFAULT_DATA_SOURCE)
+# Directory holding the prepared columnar copies of loaded sources.
+DATA_CACHE_DIR = os.environ.get("SUPERSTORE_CACHE_DIR", ".cache/datasets")
+# Seconds a download of a remote source may stall before the load fails.
+DATA_TIMEOUT = float(os.environ.get("SUPERSTORE_DOWNLOAD_TIMEOUT", "30"))
+# Seconds before a loaded dataset is reloaded from its source; 0 keeps it forever.
+DATA_MAX_AGE = float(os.environ.get("SUPERSTORE_REFRESH_SECONDS", "3600"))
+# Records per-var and per-event timings served at METRICS_PATH.
+METRICS_ENABLED = os.environ.get("DASHBOARD_METRICS", "1") != "0"
+# Also logs every var recompute and event at INFO level.
+METRICS_DEBUG_LOG = os.environ.get("DASHBOARD_METRICS_LOG", "0") == "1"
+METRICS_PATH = "/metrics"
+# Pool running the dashboard aggregations: "thread" or "process".
+AGGREGATION_POOL = os.environ.get("DASHBOARD_POOL", "thread")
+AGGREGATION_WORKERS = int(
+    os.environ.get("DASHBOARD_POOL_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+# Jobs queued or running at once, and seconds a job may wait for a slot.
+AGGREGATION_MAX_PENDING = int(os.environ.get("DASHBOARD_POOL_MAX_PENDING", "64"))
+AGGREGATION_QUEUE_TIMEOUT = float(os.environ.get("DASHBOARD_POOL_TIMEOUT", "10"))
+# Seconds a chart or table refresh waits for newer filter changes before running.
+REFRESH_DEBOUNCE = float(os.environ.get("DASHBOARD_REFRESH_DEBOUNCE", "0.05"))
+# Chart data sent to the browser: "columnar" (compact) or "records".
+CHART_ENCODING = os.environ.get("DASHBOARD_CHART_ENCODING", "columnar")
+# Sends only the changed points of columnar charts after the first refresh.
+CHART_DELTAS = os.environ.get("DASHBOARD_CHART_DELTAS", "1") != "0"
+# Prior window the trend charts and KPIs are compared with: "yoy", "mom" or "none".
+COMPARISON_MODE = os.environ.get("DASHBOARD_COMPARISON", "yoy")
+# Seconds a chat answer may take before a partial or approximate one is shown.
+CHAT_TIME_BUDGET = float(os.environ.get("DASHBOARD_CHAT_BUDGET", "2"))
+# Key signing the export and heatmap links handed to logged-in sessions. Set it
+# when several backend processes serve the app; otherwise each picks its own.
+API_SECRET = os.environ.get("DASHBOARD_API_SECRET") or secrets.token_hex(32)
+# Seconds a signed export or heatmap link stays valid.
+API_LINK_SECONDS = float(os.environ.get("DASHBOARD_API_LINK_SECONDS", "300"))
+# Bearer token scripts can send to the export and heatmap routes; empty disables it.
+API_TOKEN = os.environ.get("DASHBOARD_API_TOKEN", "")
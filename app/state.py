@@ -1,8 +1,75 @@
 import reflex as rx
 import pandas as pd
+import asyncio
+from collections.abc import Callable
 from typing import TypedDict, Any
 import logging
 import datetime
+import functools
+import json
+from reflex.config import get_config
+from app import settings
+from app.api_auth import sign_query
+from app.chat import intents
+from app.chat.intents import match_intent
+from app.data import jobs
+from app.data.comparison import COMPARISON_MONTHS
+from app.data.encoding import ChartData, decode_records, diff_columns, encode_records
+from app.data.export import EXPORT_PATH, export_query
+from app.data.filters import (
+    FilterSignature,
+    filter_signature,
+    filtered_frame,
+    resolve_date_preset,
+)
+from app.data.loader import DatasetLoader, build_superstore
+from app.data.sources import source_from_location
+from app.data.store import SUPERSTORE_DATASET, Dataset, dataset_store
+from app.executor import AggregationExecutor, ExecutorBusy
+from app.metrics import metrics, timed_event, timed_var
+from app.states.auth_state import AuthState
+
+superstore_source = source_from_location(settings.DATA_SOURCE, settings.DATA_TIMEOUT)
+superstore_loader = DatasetLoader(
+    dataset_store,
+    SUPERSTORE_DATASET,
+    functools.partial(build_superstore, superstore_source, settings.DATA_CACHE_DIR),
+    max_age=settings.DATA_MAX_AGE,
+    fetch=superstore_source.read_bytes,
+    checksum=superstore_source.checksum,
+)
+
+aggregation_executor = AggregationExecutor(
+    settings.AGGREGATION_POOL,
+    max_workers=settings.AGGREGATION_WORKERS,
+    max_pending=settings.AGGREGATION_MAX_PENDING,
+    queue_timeout=settings.AGGREGATION_QUEUE_TIMEOUT,
+    initializer=jobs.init_worker,
+    initargs=({SUPERSTORE_DATASET: superstore_loader.build},),
+)
+
+metrics.describe(
+    "dashboard_refreshes_coalesced_total",
+    "counter",
+    "Chart and table refreshes skipped because a newer one was requested.",
+)
+
+
+def _discard_result(job: asyncio.Future):
+    # Retrieves the outcome of a job nobody waits for anymore, so that its
+    # errors are not reported as never retrieved.
+    if not job.cancelled():
+        job.exception()
+
+
+def _remember_answer(request: tuple) -> Callable[[asyncio.Future], None]:
+    # Caches the answer of a chat job in this process once it finishes: jobs
+    # run on a process pool cache it in the worker only.
+    def remember(job: asyncio.Future):
+        if not job.cancelled() and job.exception() is None:
+            intents.remember_answer(*request, job.result())
+
+    return remember
 
 
 class NavItem(TypedDict):
@@ -21,7 +88,8 @@ class DashboardState(rx.State):
     """The state for the main dashboard with advanced analytics."""
 
     is_sidebar_collapsed: bool = False
-    superstore_data: pd.DataFrame = pd.DataFrame()
+    dataset_id: str = ""
+    dataset_version: int = 0
     is_loading: bool = True
     nav_items: list[NavItem] = [
         {"icon": "layout-dashboard", "label": "Dashboard", "href": "/"},
@@ -34,7 +102,10 @@ class DashboardState(rx.State):
     selected_date_range: dict[str, str] = {"start": "", "end": ""}
     selected_categories: list[str] = []
     selected_regions: list[str] = []
-    comparison_mode: str = "none"
+    # Prior window of the trend charts and KPI changes: "yoy", "mom" or "none".
+    comparison_mode: str = settings.COMPARISON_MODE
+    # "top" plots the best selling products, "density" bins every product.
+    scatter_mode: str = "top"
     search_query: str = ""
     sort_column: str = "Sales"
     sort_direction: str = "desc"
@@ -49,51 +120,87 @@ class DashboardState(rx.State):
         {"label": "Last Year", "value": "last_year"},
         {"label": "All Time", "value": "all"},
     ]
-
-    @rx.var
-    def filtered_data(self) -> pd.DataFrame:
-        """Returns filtered dataset based on current filters."""
-        if self.superstore_data.empty:
+    # Charts, KPIs and the table page are computed off the event loop by
+    # refresh_charts and refresh_table, then applied to these fields. Charts
+    # are columnar-encoded unless CHART_ENCODING is "records".
+    total_sales: float = 0.0
+    total_orders: int = 0
+    total_profit: float = 0.0
+    sales_vs_profit_trend: ChartData = []
+    category_sales_overtime: ChartData = []
+    quantity_profit_scatter: ChartData = []
+    regional_category_heatmap: ChartData = []
+    order_volume_metrics: ChartData = []
+    category_performance: ChartData = []
+    regional_sales: ChartData = []
+    top_products: list[dict[str, str | float]] = []
+    profit_by_category: ChartData = []
+    # Change of each KPI since the prior window, in percent (percentage points
+    # for profit_margin); KPIs without a prior value are missing.
+    kpi_changes: dict[str, float] = {}
+    # Without a date range, kpi_changes compare the latest year (or month) of
+    # orders with the one before instead.
+    kpi_changes_latest: bool = False
+    # Sales, Profit, Orders and Profit Margin of the latest weeks (days for short
+    # date ranges) up to the end of the filters' date range.
+    kpi_sparkline: ChartData = []
+    # Bucket size of the trend charts ("day" to "year"), picked from the length
+    # of the date range.
+    trend_granularity: str = "month"
+    filtered_table_data: list[dict[str, str | float | int]] = []
+    total_filtered_rows: int = 0
+    # Bumped by each refresh so that only the last of a burst runs.
+    _charts_generation: int = 0
+    _table_generation: int = 0
+    # Latest full value of each columnar chart, and the revision of the last
+    # update sent for it; with CHART_DELTAS the fields only carry the changes.
+    _charts: dict[str, ChartData] = {}
+    _chart_revisions: dict[str, int] = {}
+    # Whether the browser holds the charts in _charts; a page load starts over.
+    _charts_synced: bool = False
+
+    @property
+    def dataset(self) -> Dataset | None:
+        """Returns the shared dataset this session is attached to."""
+        if not self.dataset_id or not self.dataset_version:
+            return None
+        return dataset_store.get(self.dataset_id)
+
+    @property
+    def superstore_data(self) -> pd.DataFrame:
+        """Returns the full shared Superstore table."""
+        dataset = self.dataset
+        if dataset is None:
             return pd.DataFrame()
-        df = self.superstore_data.copy()
-        if self.selected_date_range.get("start") and self.selected_date_range.get(
-            "end"
-        ):
-            df["Order Date"] = pd.to_datetime(df["Order Date"], errors="coerce")
-            start_date = pd.to_datetime(self.selected_date_range["start"])
-            end_date = pd.to_datetime(self.selected_date_range["end"])
-            df = df[(df["Order Date"] >= start_date) & (df["Order Date"] <= end_date)]
-        if self.selected_categories:
-            df = df[df["Category"].isin(self.selected_categories)]
-        if self.selected_regions:
-            df = df[df["Region"].isin(self.selected_regions)]
-        return df
+        return dataset.frame
 
-    @rx.var
-    def total_sales(self) -> float:
-        """Calculates the total sales from filtered data."""
-        filtered = self.filtered_data
-        if not filtered.empty:
-            return float(filtered["Sales"].sum())
-        return 0.0
+    @property
+    def view_signature(self) -> FilterSignature:
+        """Returns the canonical signature of the chart filters."""
+        return filter_signature(
+            self.selected_date_range, self.selected_categories, self.selected_regions
+        )
 
-    @rx.var
-    def total_orders(self) -> int:
-        """Calculates the total number of orders from filtered data."""
-        filtered = self.filtered_data
-        if not filtered.empty:
-            return int(filtered["Order ID"].nunique())
-        return 0
+    @property
+    def table_signature(self) -> FilterSignature:
+        """Returns the canonical signature of the chart filters and table search."""
+        return filter_signature(
+            self.selected_date_range,
+            self.selected_categories,
+            self.selected_regions,
+            self.search_query,
+        )
 
-    @rx.var
-    def total_profit(self) -> float:
-        """Calculates the total profit from filtered data."""
-        filtered = self.filtered_data
-        if not filtered.empty:
-            return float(filtered["Profit"].sum())
-        return 0.0
+    @property
+    def filtered_data(self) -> pd.DataFrame:
+        """Returns filtered dataset based on current filters."""
+        dataset = self.dataset
+        if dataset is None:
+            return pd.DataFrame()
+        return filtered_frame(dataset, self.view_signature)
 
     @rx.var
+    @timed_var
     def profit_margin(self) -> float:
         """Calculates the profit margin in percentage."""
         if self.total_sales > 0:
@@ -101,341 +208,119 @@ class DashboardState(rx.State):
         return 0.0
 
     @rx.var
-    def sales_vs_profit_trend(self) -> list[dict[str, str | float | int]]:
-        """Multi-line chart with Sales and Profit trends over time."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            df = filtered.copy()
-            df["Order Date"] = pd.to_datetime(df["Order Date"], errors="coerce")
-            monthly_data = (
-                df.groupby(df["Order Date"].dt.to_period("M"))
-                .agg({"Sales": "sum", "Profit": "sum", "Order ID": "nunique"})
-                .reset_index()
-            )
-            monthly_data["Order Date"] = monthly_data["Order Date"].dt.strftime("%b %y")
-            monthly_data["Profit Margin"] = (
-                monthly_data["Profit"] / monthly_data["Sales"] * 100
-            ).round(2)
-            return monthly_data.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing sales vs profit trend: {e}")
-            return []
-
-    @rx.var
-    def category_sales_overtime(self) -> list[dict[str, str | float | int]]:
-        """Stacked area chart showing category contribution over time."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            df = filtered.copy()
-            df["Order Date"] = pd.to_datetime(df["Order Date"], errors="coerce")
-            monthly_category = (
-                df.groupby([df["Order Date"].dt.to_period("M"), "Category"])["Sales"]
-                .sum()
-                .reset_index()
-            )
-            monthly_category["Order Date"] = monthly_category["Order Date"].dt.strftime(
-                "%b %y"
-            )
-            pivot_data = (
-                monthly_category.pivot(
-                    index="Order Date", columns="Category", values="Sales"
-                )
-                .fillna(0)
-                .reset_index()
-            )
-            return pivot_data.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing category sales over time: {e}")
-            return []
-
-    @rx.var
-    def quantity_profit_scatter(self) -> list[dict[str, str | float | int]]:
-        """Scatter plot with Quantity vs Profit, sized by Sales."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            df = filtered.copy()
-            scatter_data = (
-                df.groupby("Product Name")
-                .agg({"Quantity": "sum", "Profit": "sum", "Sales": "sum"})
-                .reset_index()
-            )
-            max_sales = scatter_data["Sales"].max()
-            min_sales = scatter_data["Sales"].min()
-            if max_sales > min_sales:
-                scatter_data["Bubble Size"] = (
-                    5
-                    + 45 * (scatter_data["Sales"] - min_sales) / (max_sales - min_sales)
-                ).round(0)
-            else:
-                scatter_data["Bubble Size"] = 25
-            scatter_data = scatter_data.nlargest(100, "Sales")
-            return scatter_data.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing quantity profit scatter: {e}")
-            return []
-
-    @rx.var
-    def regional_category_heatmap(self) -> list[dict[str, str | float | int]]:
-        """Heatmap data for Region vs Category performance."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            df = filtered.copy()
-            heatmap_data = (
-                df.groupby(["Region", "Category"])["Sales"].sum().reset_index()
-            )
-            for region in heatmap_data["Region"].unique():
-                region_data = heatmap_data[heatmap_data["Region"] == region]
-                max_sales = region_data["Sales"].max()
-                min_sales = region_data["Sales"].min()
-                if max_sales > min_sales:
-                    heatmap_data.loc[
-                        heatmap_data["Region"] == region, "Performance Score"
-                    ] = (
-                        (region_data["Sales"] - min_sales)
-                        / (max_sales - min_sales)
-                        * 100
-                    ).round(1)
-                else:
-                    heatmap_data.loc[
-                        heatmap_data["Region"] == region, "Performance Score"
-                    ] = 50
-            return heatmap_data.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing regional category heatmap: {e}")
-            return []
-
-    @rx.var
-    def order_volume_metrics(self) -> list[dict[str, str | float | int]]:
-        """Combined chart with Order Volume (bars) and Average Order Value (line)."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            df = filtered.copy()
-            df["Order Date"] = pd.to_datetime(df["Order Date"], errors="coerce")
-            monthly_orders = (
-                df.groupby(df["Order Date"].dt.to_period("M"))
-                .agg({"Order ID": "nunique", "Sales": "sum"})
-                .reset_index()
-            )
-            monthly_orders["Order Date"] = monthly_orders["Order Date"].dt.strftime(
-                "%b %y"
-            )
-            monthly_orders["Average Order Value"] = (
-                monthly_orders["Sales"] / monthly_orders["Order ID"]
-            ).round(2)
-            monthly_orders.rename(columns={"Order ID": "Order Count"}, inplace=True)
-            return monthly_orders.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing order volume metrics: {e}")
-            return []
-
-    @rx.var
-    def sales_trend_data(self) -> list[dict[str, str | float]]:
+    @timed_var
+    def sales_trend_data(self) -> ChartData:
         """Legacy sales trend for backward compatibility."""
-        return [
-            {"Order Date": item["Order Date"], "Sales": item["Sales"]}
-            for item in self.sales_vs_profit_trend
+        records = [
+            {
+                name: item[name]
+                for name in ("Order Date", "Sales", "Prior Sales")
+                if name in item
+            }
+            for item in self._chart_records("sales_vs_profit_trend")
         ]
+        if settings.CHART_ENCODING == "columnar":
+            return encode_records(records)
+        return records
 
     @rx.var
-    def category_performance(self) -> list[dict[str, str | float]]:
-        """Calculates sales for each product category from filtered data."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            category_sales = (
-                filtered.groupby("Category")["Sales"]
-                .sum()
-                .reset_index()
-                .sort_values(by="Sales", ascending=False)
-            )
-            return category_sales.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing category performance data: {e}")
-            return []
-
-    @rx.var
-    def regional_sales(self) -> list[dict[str, str | float]]:
-        """Calculates total sales per region from filtered data."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            regional_data = (
-                filtered.groupby("Region")["Sales"]
-                .sum()
-                .reset_index()
-                .sort_values(by="Sales", ascending=False)
-            )
-            return regional_data.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing regional sales data: {e}")
-            return []
-
-    @rx.var
-    def top_products(self) -> list[dict[str, str | float]]:
-        """Finds the top 10 products by sales from filtered data."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            top_prods = (
-                filtered.groupby("Product Name")["Sales"]
-                .sum()
-                .nlargest(10)
-                .reset_index()
-            )
-            return top_prods.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing top products data: {e}")
-            return []
-
-    @rx.var
-    def profit_by_category(self) -> list[dict[str, str | float]]:
-        """Calculates total profit for each product category from filtered data."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            profit_data = (
-                filtered.groupby("Category")["Profit"]
-                .sum()
-                .reset_index()
-                .sort_values(by="Profit", ascending=False)
-            )
-            return profit_data.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing profit by category data: {e}")
-            return []
-
-    @rx.var
-    def filtered_table_data(self) -> list[dict[str, str | float | int]]:
-        """Returns paginated and sorted table data with search."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return []
-        try:
-            df = filtered.copy()
-            if self.search_query.strip():
-                search_lower = self.search_query.lower()
-                mask = (
-                    df["Product Name"].str.lower().str.contains(search_lower, na=False)
-                    | df["Category"].str.lower().str.contains(search_lower, na=False)
-                    | df["Customer Name"]
-                    .str.lower()
-                    .str.contains(search_lower, na=False)
-                    | df["Region"].str.lower().str.contains(search_lower, na=False)
-                )
-                df = df[mask]
-            ascending = self.sort_direction == "asc"
-            df = df.sort_values(by=self.sort_column, ascending=ascending)
-            start_idx = (self.current_page - 1) * self.items_per_page
-            end_idx = start_idx + self.items_per_page
-            df = df.iloc[start_idx:end_idx]
-            display_columns = [
-                "Order Date",
-                "Product Name",
-                "Category",
-                "Sales",
-                "Quantity",
-                "Profit",
-                "Customer Name",
-                "Region",
-            ]
-            df = df[display_columns]
-            return df.to_dict("records")
-        except Exception as e:
-            logging.exception(f"Error processing filtered table data: {e}")
-            return []
-
-    @rx.var
-    def total_filtered_rows(self) -> int:
-        """Total number of rows after filtering (for pagination)."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return 0
-        if self.search_query.strip():
-            search_lower = self.search_query.lower()
-            mask = (
-                filtered["Product Name"]
-                .str.lower()
-                .str.contains(search_lower, na=False)
-                | filtered["Category"].str.lower().str.contains(search_lower, na=False)
-                | filtered["Customer Name"]
-                .str.lower()
-                .str.contains(search_lower, na=False)
-                | filtered["Region"].str.lower().str.contains(search_lower, na=False)
-            )
-            return int(mask.sum())
-        return len(filtered)
-
-    @rx.var
+    @timed_var
     def total_pages(self) -> int:
         """Calculate total pages for pagination."""
         return max(1, -(-self.total_filtered_rows // self.items_per_page))
 
-    @rx.var
-    def export_data(self) -> str:
-        """Export filtered data as CSV string."""
-        filtered = self.filtered_data
-        if filtered.empty:
-            return ""
-        return filtered.to_csv(index=False)
+    @rx.event
+    @timed_event
+    async def export_data(self, compress: bool = False):
+        """Download the filtered data as a CSV streamed by the backend."""
+        auth = await self.get_state(AuthState)
+        if not auth.is_authenticated:
+            return rx.redirect("/login")
+        query = sign_query(export_query(self.view_signature, compress))
+        url = f"{get_config().api_url}{EXPORT_PATH}?{query}"
+        return rx.call_script(f"window.location.assign({json.dumps(url)})")
 
     @rx.event
+    @timed_event
     def apply_date_filter(self, form_data: dict[str, str]):
         """Apply date range filter."""
         self.selected_date_range = {
             "start": form_data.get("start_date", ""),
             "end": form_data.get("end_date", ""),
         }
+        return [DashboardState.refresh_charts, DashboardState.refresh_table]
 
     @rx.event
+    @timed_event
+    def apply_date_preset(self, preset: str):
+        """Apply one of the date range presets ("30d", "90d", "year", ...)."""
+        dataset = self.dataset
+        latest = dataset.indexes.dates.latest if dataset and dataset.indexes else None
+        self.selected_date_range = resolve_date_preset(preset, latest)
+        return [DashboardState.refresh_charts, DashboardState.refresh_table]
+
+    @rx.event
+    @timed_event
     def apply_category_filter(self, category: str):
         """Toggle category filter."""
         if category in self.selected_categories:
             self.selected_categories.remove(category)
         else:
             self.selected_categories.append(category)
+        return [DashboardState.refresh_charts, DashboardState.refresh_table]
 
     @rx.event
+    @timed_event
     def apply_region_filter(self, region: str):
         """Toggle region filter."""
         if region in self.selected_regions:
             self.selected_regions.remove(region)
         else:
             self.selected_regions.append(region)
+        return [DashboardState.refresh_charts, DashboardState.refresh_table]
 
     @rx.event
+    @timed_event
     def clear_filters(self):
         """Clear all filters."""
         self.selected_date_range = {"start": "", "end": ""}
         self.selected_categories = []
         self.selected_regions = []
         self.search_query = ""
+        return [DashboardState.refresh_charts, DashboardState.refresh_table]
 
     @rx.event
+    @timed_event
     def set_comparison_mode(self, mode: str):
-        """Set comparison mode (YoY, MoM, etc)."""
-        self.comparison_mode = mode
+        """Set comparison mode ("yoy", "mom" or "none")."""
+        if mode == "none" or mode in COMPARISON_MONTHS:
+            self.comparison_mode = mode
+            return DashboardState.refresh_charts
+
+    @rx.event
+    def resync_charts(self):
+        """Resends every chart whole, after the browser got changes it cannot apply."""
+        self._charts_synced = False
+        return DashboardState.refresh_charts
+
+    @rx.event
+    @timed_event
+    def set_scatter_mode(self, mode: str):
+        """Switch the quantity/profit scatter between top products and density."""
+        if mode in jobs.SCATTER_VIEWS:
+            self.scatter_mode = mode
+            return DashboardState.refresh_charts
 
     @rx.event
+    @timed_event
     def set_search_query(self, query: str):
         """Set search query for table filtering."""
         self.search_query = query
         self.current_page = 1
+        return DashboardState.refresh_table
 
     @rx.event
+    @timed_event
     def sort_table(self, column: str):
         """Sort table by column."""
         if self.sort_column == column:
@@ -444,38 +329,154 @@ class DashboardState(rx.State):
             self.sort_column = column
             self.sort_direction = "desc"
         self.current_page = 1
+        return DashboardState.refresh_table
 
     @rx.event
+    @timed_event
     def set_page(self, page: int):
         """Set current page for table pagination."""
         self.current_page = max(1, min(page, self.total_pages))
+        return DashboardState.refresh_table
 
     @rx.event
+    @timed_event
     def previous_page(self):
         """Go to previous page."""
-        self.set_page(self.current_page - 1)
+        return self.set_page(self.current_page - 1)
 
     @rx.event
+    @timed_event
     def next_page(self):
         """Go to next page."""
-        self.set_page(self.current_page + 1)
+        return self.set_page(self.current_page + 1)
 
     @rx.event
+    @timed_event
     def toggle_sidebar(self):
         """Toggles the sidebar collapse state."""
         self.is_sidebar_collapsed = not self.is_sidebar_collapsed
 
+    async def _run_job(
+        self, job: Callable[..., dict[str, Any]], *args: Any, key: Any = None
+    ):
+        """Runs a job on the aggregation pool, returning None if it did not finish."""
+        try:
+            return await aggregation_executor.run(job, *args, key=key)
+        except jobs.JobCancelled:
+            pass
+        except ExecutorBusy as e:
+            logging.warning(f"Skipping {job.__name__}: {e}")
+        except Exception as e:
+            logging.exception(f"Error running {job.__name__}: {e}")
+        return None
+
+    async def _refresh(
+        self,
+        kind: str,
+        job: Callable[..., dict[str, Any]],
+        request: Callable[["DashboardState"], tuple],
+    ):
+        """Runs ``job`` for the latest ``request`` of this session and applies it.
+
+        Refreshes of the same kind requested less than REFRESH_DEBOUNCE seconds
+        apart collapse into the last one, and a newer refresh cancels the job of
+        an older one still on the pool.
+        """
+        generation_field = f"_{kind}_generation"
+        async with self:
+            generation = getattr(self, generation_field) + 1
+            setattr(self, generation_field, generation)
+        if settings.REFRESH_DEBOUNCE > 0:
+            await asyncio.sleep(settings.REFRESH_DEBOUNCE)
+        async with self:
+            if getattr(self, generation_field) != generation:
+                metrics.inc("dashboard_refreshes_coalesced_total", {"kind": kind})
+                return
+            snapshot = request(self)
+            key = (self.router.session.client_token, kind)
+        if not snapshot[1]:
+            return
+        results = await self._run_job(job, *snapshot, key=key)
+        async with self:
+            # Results for filters changed since are dropped; their refresh follows.
+            if results is not None and request(self) == snapshot:
+                self._apply_results(results)
+
+    def _apply_results(self, results: dict[str, Any]):
+        """Sets the refreshed fields, sending only the changes of columnar charts."""
+        charts = dict(self._charts)
+        revisions = dict(self._chart_revisions)
+        for name, value in results.items():
+            if name not in jobs.COLUMNAR_CHARTS:
+                setattr(self, name, value)
+                continue
+            previous = charts.get(name) if self._charts_synced else None
+            if value == previous:
+                continue
+            charts[name] = value
+            if not settings.CHART_DELTAS or not isinstance(value, dict):
+                setattr(self, name, value)
+                continue
+            revision = revisions[name] = revisions.get(name, 0) + 1
+            patch = diff_columns(previous, value) if previous else None
+            update = value if patch is None else patch | {"base": revision - 1}
+            setattr(self, name, update | {"series": name, "revision": revision})
+        self._charts = charts
+        self._chart_revisions = revisions
+        self._charts_synced = True
+
+    def _chart_records(self, name: str) -> list[dict[str, Any]]:
+        """Returns the records of a chart, whatever was last sent for it."""
+        return decode_records(self._charts.get(name, []))
+
     @rx.event(background=True)
+    @timed_event
+    async def refresh_charts(self):
+        """Recomputes the charts and KPIs for the current filters on the pool."""
+        await self._refresh("charts", jobs.chart_views, DashboardState._chart_request)
+
+    @rx.event(background=True)
+    @timed_event
+    async def refresh_table(self):
+        """Recomputes the current page of the orders table on the pool."""
+        await self._refresh("table", jobs.table_view, DashboardState._table_request)
+
+    def _chart_request(self) -> tuple:
+        return (
+            self.dataset_id,
+            self.dataset_version,
+            self.view_signature,
+            settings.CHART_ENCODING == "columnar",
+            self.scatter_mode,
+            self.comparison_mode,
+        )
+
+    def _table_request(self) -> tuple:
+        return (
+            self.dataset_id,
+            self.dataset_version,
+            self.table_signature,
+            self.sort_column,
+            self.sort_direction,
+            self.current_page,
+            self.items_per_page,
+        )
+
+    @rx.event(background=True)
+    @timed_event
     async def load_data(self):
-        """Loads the superstore dataset and initializes filter options."""
+        """Attaches to the shared superstore dataset and initializes filter options."""
         try:
-            url = "https://raw.githubusercontent.com/atharvayeola/superstore-analytics-pipeline/main/superstore.csv"
-            df = pd.read_csv(url, encoding="latin1")
+            dataset = await superstore_loader.get()
+            df = dataset.frame
             async with self:
-                self.superstore_data = df
+                self.dataset_id = dataset.dataset_id
+                self.dataset_version = dataset.version
                 self.available_categories = df["Category"].unique().tolist()
                 self.available_regions = df["Region"].unique().tolist()
                 self.is_loading = False
+                self._charts_synced = False
+            return [DashboardState.refresh_charts, DashboardState.refresh_table]
         except Exception as e:
             logging.exception(f"Error loading data: {e}")
             async with self:
@@ -489,6 +490,10 @@ class ChatState(rx.State):
     messages: list[ChatMessage] = []
     current_input: str = ""
     is_processing: bool = False
+    # Bumped by each query so that a newer one stops the previous answer.
+    _query_generation: int = 0
+    # Index in messages of the answer being streamed, -1 when there is none.
+    _answer_message: int = -1
     query_suggestions: list[str] = [
         "What are the top selling products?",
         "Show me sales vs profit trends",
@@ -498,6 +503,7 @@ class ChatState(rx.State):
     ]
 
     @rx.event
+    @timed_event
     def toggle_chat(self):
         self.is_chat_open = not self.is_chat_open
         if self.is_chat_open and (not self.messages):
@@ -514,80 +520,122 @@ class ChatState(rx.State):
             }
         )
 
-    @rx.event
-    async def process_query(self, query: str):
-        """Enhanced query processing with advanced analytics."""
-        dashboard_state = await self.get_state(DashboardState)
-        if dashboard_state.superstore_data.empty:
-            self._add_bot_message("The data is not loaded yet. Please wait a moment.")
-            return
+    def _stop_answer(self, note: str):
+        """Ends the answer being streamed with ``note``, under what it has shown."""
+        if 0 <= self._answer_message < len(self.messages):
+            self.messages[self._answer_message]["content"] += f"\n\n{note}"
+        else:
+            self._add_bot_message(note)
+        self._answer_message = -1
+
+    async def _answer(self, request: tuple, key: tuple) -> str | None:
+        """Returns the answer to a chat request, or None if it was cancelled.
+
+        Answers not ready after CHAT_TIME_BUDGET seconds are replaced by the
+        cached answer over every order, or by a note, both marked as timed out. The job is released and
+        keeps running, even if the answer is stopped or superseded, so that
+        asking again gets the full answer from the cache.
+        """
+        cached = intents.cached_answer(*request)
+        if cached is not None:
+            return cached
+        job = asyncio.ensure_future(
+            aggregation_executor.run(intents.answer, *request, key=key)
+        )
+        job.add_done_callback(_remember_answer(request))
+        done, _ = await asyncio.wait({job}, timeout=settings.CHAT_TIME_BUDGET)
+        if not done:
+            aggregation_executor.release(key)
+            job.add_done_callback(_discard_result)
+            dataset_id, version, signature, name = request
+            timed_out = f"_Timed out after {settings.CHAT_TIME_BUDGET:g}s"
+            unfiltered = filter_signature({"start": "", "end": ""}, [], [])
+            if signature != unfiltered:
+                overall = intents.cached_answer(dataset_id, version, unfiltered, name)
+                if overall:
+                    return f"{overall}\n\n{timed_out}: approximate, computed over all orders while the answer for your filters is still running._"
+            return f"{timed_out}: this analysis is still running. Ask again in a moment for the full answer._"
         try:
-            df = (
-                dashboard_state.filtered_data
-                if not dashboard_state.filtered_data.empty
-                else dashboard_state.superstore_data
+            return job.result()
+        except jobs.JobCancelled:
+            return None
+        except ExecutorBusy:
+            return "The assistant is busy right now. Please try again in a moment."
+
+    @rx.event(background=True)
+    @timed_event
+    async def process_query(self, query: str):
+        """Streams the answer to a query: its headline first, then each paragraph.
+
+        A newer query or cancel_query stops the answer being streamed, which
+        keeps the paragraphs shown so far and ends with a note saying so.
+        """
+        intent = match_intent(query)
+        async with self:
+            if not self.is_processing:
+                return
+            if self._answer_message >= 0:
+                self._stop_answer("_Stopped: replaced by your newer question._")
+            self._query_generation += 1
+            generation = self._query_generation
+            dashboard_state = await self.get_state(DashboardState)
+            request = (
+                dashboard_state.dataset_id,
+                dashboard_state.dataset_version,
+                dashboard_state.view_signature,
+                intent.name if intent is not None else "",
             )
-            query = query.lower()
-            response = "I'm sorry, I could not understand your query. Try one of the suggestions."
-            if "sales vs profit" in query or "sales profit trend" in query:
-                trend_data = dashboard_state.sales_vs_profit_trend
-                if trend_data:
-                    latest = trend_data[-1]
-                    response = f"📈 **Sales vs Profit Trend Analysis:**\n\nLatest month ({latest['Order Date']}):\n- Sales: ${latest['Sales']:,.2f}\n- Profit: ${latest['Profit']:,.2f}\n- Profit Margin: {latest['Profit Margin']:.1f}%\n\nThe trend shows {('strong' if latest['Profit Margin'] > 15 else 'moderate' if latest['Profit Margin'] > 10 else 'weak')} profitability with a {latest['Profit Margin']:.1f}% margin."
-            elif "top selling products" in query or "best products" in query:
-                top_prods = (
-                    df.groupby("Product Name")["Sales"].sum().nlargest(5).reset_index()
-                )
-                response = """🏆 **Top 5 Selling Products:**
-"""
-                for idx, row in top_prods.iterrows():
-                    response += (
-                        f"{idx + 1}. {row['Product Name']}: ${row['Sales']:,.2f}\n"
-                    )
-            elif (
-                "region" in query
-                and "category" in query
-                and ("perform" in query or "best" in query)
-            ):
-                heatmap_data = dashboard_state.regional_category_heatmap
-                if heatmap_data:
-                    best = max(heatmap_data, key=lambda x: x["Sales"])
-                    response = f"🎯 **Regional-Category Performance:**\n\nBest performing combination:\n- Region: **{best['Region']}**\n- Category: **{best['Category']}**\n- Sales: ${best['Sales']:,.2f}\n- Performance Score: {best['Performance Score']:.1f}/100\n\nThis combination generates the highest sales volume in our dataset."
-            elif "quantity" in query and "profit" in query:
-                scatter_data = dashboard_state.quantity_profit_scatter
-                if scatter_data:
-                    high_profit = max(scatter_data, key=lambda x: x["Profit"])
-                    high_quantity = max(scatter_data, key=lambda x: x["Quantity"])
-                    response = f"""📊 **Quantity vs Profit Analysis:**\n\nHighest Profit Product:\n- {high_profit["Product Name"]}: ${high_profit["Profit"]:,.2f} profit from {high_profit["Quantity"]} units\n\nHighest Quantity Product:\n- {high_quantity["Product Name"]}: {high_quantity["Quantity"]} units sold, ${high_quantity["Profit"]:,.2f} profit\n\n**Insight:** {("High quantity doesn't always mean high profit" if high_profit["Product Name"] != high_quantity["Product Name"] else "This product excels in both volume and profitability")}."""
-            elif "order volume" in query or "order trend" in query:
-                order_data = dashboard_state.order_volume_metrics
-                if order_data:
-                    latest = order_data[-1]
-                    response = f"📦 **Order Volume Analysis:**\n\nLatest month ({latest['Order Date']}):\n- Order Count: {latest['Order Count']} orders\n- Average Order Value: ${latest['Average Order Value']:.2f}\n- Total Sales: ${latest['Sales']:,.2f}\n\nThe average customer spends ${latest['Average Order Value']:.2f} per order."
-            elif "profit margin" in query:
-                margin = dashboard_state.profit_margin
-                response = f"💰 **Profit Margin Analysis:**\n\nCurrent overall profit margin: **{margin:.2f}%**\n\nThis is {('excellent (>20%)' if margin > 20 else 'good (15-20%)' if margin > 15 else 'average (10-15%)' if margin > 10 else 'below average (<10%)')} for retail operations."
-            elif "category" in query and ("best" in query or "perform" in query):
-                categories = (
-                    df.groupby("Category")
-                    .agg({"Sales": "sum", "Profit": "sum"})
-                    .reset_index()
+            if intent is None or not request[1]:
+                self._add_bot_message(
+                    "I'm sorry, I could not understand your query. Try one of the suggestions."
+                    if request[1]
+                    else "The data is not loaded yet. Please wait a moment."
                 )
-                categories["Profit Margin"] = (
-                    categories["Profit"] / categories["Sales"] * 100
-                ).round(2)
-                best_sales = categories.loc[categories["Sales"].idxmax()]
-                best_margin = categories.loc[categories["Profit Margin"].idxmax()]
-                response = f"📈 **Category Performance Analysis:**\n\nBest by Sales Volume:\n- **{best_sales['Category']}**: ${best_sales['Sales']:,.2f} ({best_sales['Profit Margin']:.1f}% margin)\n\nBest by Profit Margin:\n- **{best_margin['Category']}**: {best_margin['Profit Margin']:.1f}% margin (${best_margin['Sales']:,.2f} sales)\n\n**Recommendation:** Focus on {best_sales['Category']} for volume growth and {best_margin['Category']} for profitability."
-            self._add_bot_message(response)
+                self.is_processing = False
+                return
+            self._add_bot_message(intent.title)
+            message = len(self.messages) - 1
+            self._answer_message = message
+            key = (self.router.session.client_token, "chat")
+        try:
+            body = await self._answer(request, key)
         except Exception as e:
             logging.exception(f"Error processing query: {e}")
-            self._add_bot_message(
-                "Sorry, I encountered an error processing your query. Please try a different question."
-            )
+            body = "Sorry, I encountered an error processing your query. Please try a different question."
+        if body is None:
+            async with self:
+                if self._query_generation == generation:
+                    self._stop_answer("_Stopped._")
+                    self.is_processing = False
+            return
+        text = intent.title
+        paragraphs = (
+            body.split("\n\n") if body else ["No orders match the current filters."]
+        )
+        for i, paragraph in enumerate(paragraphs):
+            text += f"\n\n{paragraph}"
+            async with self:
+                if self._query_generation != generation:
+                    return
+                self.messages[message]["content"] = text
+                if i == len(paragraphs) - 1:
+                    self._answer_message = -1
+                    self.is_processing = False
 
     @rx.event
-    async def handle_submit(self, form_data: dict[str, str]):
+    @timed_event
+    def cancel_query(self):
+        """Stops the answer being streamed."""
+        if not self.is_processing:
+            return
+        self._query_generation += 1
+        self.is_processing = False
+        aggregation_executor.cancel((self.router.session.client_token, "chat"))
+        self._stop_answer("_Stopped._")
+
+    @rx.event
+    @timed_event
+    def handle_submit(self, form_data: dict[str, str]):
         query = form_data.get("query", "").strip()
         if not query:
             return
@@ -600,11 +648,10 @@ class ChatState(rx.State):
             }
         )
         self.is_processing = True
-        yield
-        await self.process_query(query)
-        self.is_processing = False
+        return ChatState.process_query(query)
 
     @rx.event
-    async def handle_suggestion_click(self, suggestion: str):
+    @timed_event
+    def handle_suggestion_click(self, suggestion: str):
         self.current_input = suggestion
-        return await ChatState.handle_submit({"query": suggestion})
\ No newline at end of file
+        return ChatState.handle_submit({"query": suggestion})
\ No newline at end of file
@@ -0,0 +1,50 @@
+import argparse
+import json
+
+
+def _flatten(results: dict) -> dict[str, float]:
+    """Maps each timing in a result file to a dotted name and its median."""
+    timings = {
+        f"load.{name}": value
+        for name, value in results["load"].items()
+        if name.endswith("_ms")
+    }
+    for scenario, variables in results["vars"].items():
+        for var, runs in variables.items():
+            for run, summary in runs.items():
+                timings[f"vars.{scenario}.{var}.{run}"] = summary["median_ms"]
+    for event, parts in results["events"].items():
+        timings[f"events.{event}"] = parts["total"]["median_ms"]
+    return timings
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> list[tuple]:
+    """Returns timings present in both runs whose ratio moved past ``threshold``."""
+    before, after = _flatten(baseline), _flatten(candidate)
+    rows = []
+    for name in before.keys() & after.keys():
+        ratio = after[name] / before[name] if before[name] else float("inf")
+        if abs(ratio - 1) >= threshold:
+            rows.append((name, before[name], after[name], ratio))
+    return sorted(rows, key=lambda row: row[3], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold", type=float, default=0.1, help="Minimum relative change"
+    )
+    args = parser.parse_args()
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+    print(f"{baseline['meta']['commit']} -> {candidate['meta']['commit']}")
+    for name, before, after, ratio in compare(baseline, candidate, args.threshold):
+        print(f"{ratio:7.2f}x  {before:10.3f} -> {after:10.3f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+import argparse
+import math
+import numpy as np
+import pandas as pd
+
+SIZES = {"10k": 10_000, "1m": 1_000_000, "10m": 10_000_000}
+# Cardinalities of the public Superstore extract, which has 9,994 order lines.
+BASE_ROWS = 9_994
+BASE_PRODUCTS = 1_862
+BASE_CUSTOMERS = 793
+LINES_PER_ORDER = 2.0
+CITIES_PER_STATE = 11
+START_DATE = "2014-01-01"
+YEARS = 4
+CATALOG = {
+    "Furniture": {"Bookcases": 228, "Chairs": 617, "Furnishings": 957, "Tables": 319},
+    "Office Supplies": {
+        "Appliances": 466,
+        "Art": 796,
+        "Binders": 1523,
+        "Envelopes": 254,
+        "Fasteners": 217,
+        "Labels": 364,
+        "Paper": 1370,
+        "Storage": 846,
+        "Supplies": 190,
+    },
+    "Technology": {"Accessories": 775, "Copiers": 68, "Machines": 115, "Phones": 889},
+}
+# Median unit price of each category, used to draw product list prices.
+CATEGORY_PRICES = {"Furniture": 180.0, "Office Supplies": 20.0, "Technology": 150.0}
+REGIONS = {
+    "West": ["California", "Washington", "Arizona", "Colorado", "Oregon", "Utah"],
+    "East": ["New York", "Pennsylvania", "Ohio", "Massachusetts", "New Jersey"],
+    "Central": ["Texas", "Illinois", "Michigan", "Indiana", "Wisconsin"],
+    "South": ["Florida", "North Carolina", "Virginia", "Georgia", "Tennessee"],
+}
+REGION_WEIGHTS = {"West": 0.32, "East": 0.28, "Central": 0.23, "South": 0.17}
+SHIP_MODES = {
+    "Standard Class": (0.60, 4, 7),
+    "Second Class": (0.19, 2, 5),
+    "First Class": (0.16, 1, 4),
+    "Same Day": (0.05, 0, 0),
+}
+SEGMENTS = {"Consumer": 0.52, "Corporate": 0.30, "Home Office": 0.18}
+DISCOUNTS = {
+    0.0: 0.48,
+    0.1: 0.05,
+    0.2: 0.37,
+    0.3: 0.02,
+    0.4: 0.02,
+    0.5: 0.01,
+    0.7: 0.03,
+    0.8: 0.02,
+}
+FIRST_NAMES = ["Alex", "Jordan", "Sam", "Taylor", "Morgan", "Casey", "Riley", "Jamie"]
+LAST_NAMES = ["Smith", "Nguyen", "Garcia", "Brown", "Khan", "Muller", "Rossi", "Kim"]
+
+
+def parse_size(value: str) -> int:
+    """Returns the row count for a size label such as ``1m`` or a plain integer."""
+    return SIZES.get(value.lower()) or int(value.replace("_", ""))
+
+
+def _labels(prefix: str, count: int, width: int) -> np.ndarray:
+    return np.array([f"{prefix}{i:0{width}d}" for i in range(count)], dtype=object)
+
+
+def _choice(rng: np.random.Generator, weights: dict, size: int) -> np.ndarray:
+    p = np.array(list(weights.values()), dtype=float)
+    return rng.choice(len(weights), size=size, p=p / p.sum())
+
+
+def generate_superstore(rows: int, seed: int = 0) -> pd.DataFrame:
+    """Returns a deterministic Superstore-shaped table with ``rows`` order lines.
+
+    Columns, dtypes and value formats match the public extract. Orders hold
+    about two lines each and the customer base grows linearly with the row
+    count, while the product catalog grows with its square root, so larger
+    tables keep realistic group sizes for every dimension. Customers keep
+    their segment and location across orders, and products their category,
+    sub-category and list price.
+    """
+    rng = np.random.default_rng(seed)
+    scale = rows / BASE_ROWS
+    n_orders = max(1, math.ceil(rows / LINES_PER_ORDER))
+    n_customers = max(1, round(BASE_CUSTOMERS * scale))
+    n_products = max(1, round(BASE_PRODUCTS * math.sqrt(max(scale, 1.0))))
+
+    sub_categories = [(c, s, w) for c, subs in CATALOG.items() for s, w in subs.items()]
+    product_sub = _choice(
+        rng, {i: w for i, (_, _, w) in enumerate(sub_categories)}, n_products
+    )
+    product_category = np.array(
+        [sub_categories[i][0] for i in product_sub], dtype=object
+    )
+    product_sub_name = np.array(
+        [sub_categories[i][1] for i in product_sub], dtype=object
+    )
+    product_names = np.array(
+        [f"{sub_categories[s][1]} {i:05d}" for i, s in enumerate(product_sub)],
+        dtype=object,
+    )
+    product_ids = np.array(
+        [
+            f"{c[:3].upper()}-{s[:2].upper()}-{10_000_000 + i}"
+            for i, (c, s) in enumerate(zip(product_category, product_sub_name))
+        ],
+        dtype=object,
+    )
+    base_price = np.array([CATEGORY_PRICES[c] for c in product_category])
+    product_price = base_price * rng.lognormal(0.0, 0.9, n_products)
+    product_margin = rng.normal(0.15, 0.12, n_products)
+    popularity = 1.0 / (np.arange(n_products) + 10.0)
+    popularity = rng.permutation(popularity / popularity.sum())
+
+    states = [(r, s) for r, names in REGIONS.items() for s in names]
+    state_weights = np.array([REGION_WEIGHTS[r] / len(REGIONS[r]) for r, _ in states])
+    cities = [
+        (r, s, f"{s} City {k + 1}") for r, s in states for k in range(CITIES_PER_STATE)
+    ]
+    city_weights = np.repeat(state_weights / CITIES_PER_STATE, CITIES_PER_STATE)
+    customer_city = rng.choice(
+        len(cities), n_customers, p=city_weights / city_weights.sum()
+    )
+    customer_segment = _choice(rng, SEGMENTS, n_customers)
+    first = rng.integers(0, len(FIRST_NAMES), n_customers)
+    last = rng.integers(0, len(LAST_NAMES), n_customers)
+    customer_names = np.array(
+        [
+            f"{FIRST_NAMES[f]} {LAST_NAMES[l]} {i:06d}"
+            for i, (f, l) in enumerate(zip(first, last))
+        ],
+        dtype=object,
+    )
+    customer_ids = _labels("CU-", n_customers, 6)
+
+    # Sales grow about 20% a year and peak towards the end of each year.
+    days = pd.date_range(START_DATE, periods=365 * YEARS, freq="D")
+    years = days.year.to_numpy()
+    day_weights = 1.2 ** (years - years[0]) * (
+        1.0 + 0.6 * (days.month.to_numpy() >= 9) + 0.3 * (days.dayofweek.to_numpy() < 5)
+    )
+    order_day = np.sort(
+        rng.choice(len(days), n_orders, p=day_weights / day_weights.sum())
+    )
+    order_customer = rng.integers(0, n_customers, n_orders)
+    order_mode = _choice(rng, {m: w for m, (w, _, _) in SHIP_MODES.items()}, n_orders)
+    mode_min = np.array([lo for _, lo, _ in SHIP_MODES.values()])[order_mode]
+    mode_max = np.array([hi for _, _, hi in SHIP_MODES.values()])[order_mode]
+    ship_delay = rng.integers(mode_min, mode_max + 1)
+    order_ids = (
+        pd.Series(years[order_day]).astype(str).radd("CA-")
+        + pd.Series(np.arange(100_000, 100_000 + n_orders)).astype(str).radd("-")
+    ).to_numpy(dtype=object)
+
+    line_order = np.sort(rng.integers(0, n_orders, rows))
+    line_product = rng.choice(n_products, rows, p=popularity)
+    quantity = np.minimum(rng.geometric(0.28, rows), 14)
+    discount_levels = np.array(list(DISCOUNTS))
+    discount = discount_levels[_choice(rng, DISCOUNTS, rows)]
+    sales = product_price[line_product] * quantity * (1.0 - discount)
+    margin = product_margin[line_product] - 1.1 * discount + rng.normal(0, 0.05, rows)
+    profit = sales * margin
+
+    ship_modes = np.array(list(SHIP_MODES), dtype=object)
+    segments = np.array(list(SEGMENTS), dtype=object)
+    customer = order_customer[line_order]
+    city = customer_city[customer]
+    order_date = days[order_day][line_order]
+    return pd.DataFrame(
+        {
+            "Row ID": np.arange(1, rows + 1),
+            "Order ID": order_ids[line_order],
+            "Order Date": order_date,
+            "Ship Date": order_date + pd.to_timedelta(ship_delay[line_order], unit="D"),
+            "Ship Mode": ship_modes[order_mode[line_order]],
+            "Customer ID": customer_ids[customer],
+            "Customer Name": customer_names[customer],
+            "Segment": segments[customer_segment[customer]],
+            "Country": "United States",
+            "City": np.array([c for _, _, c in cities], dtype=object)[city],
+            "State": np.array([s for _, s, _ in cities], dtype=object)[city],
+            "Postal Code": 10_000 + city * 37,
+            "Region": np.array([r for r, _, _ in cities], dtype=object)[city],
+            "Product ID": product_ids[line_product],
+            "Category": product_category[line_product],
+            "Sub-Category": product_sub_name[line_product],
+            "Product Name": product_names[line_product],
+            "Sales": np.round(sales, 4),
+            "Quantity": quantity,
+            "Discount": discount,
+            "Profit": np.round(profit, 4),
+        }
+    )
+
+
+def write_superstore(frame: pd.DataFrame, path: str):
+    """Writes a generated table in the format implied by the file extension."""
+    if path.endswith(".parquet"):
+        frame.to_parquet(path, index=False)
+    elif path.endswith((".arrow", ".feather")):
+        frame.to_feather(path)
+    else:
+        frame.to_csv(path, index=False, date_format="%m/%d/%Y", encoding="latin1")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic Superstore table."
+    )
+    parser.add_argument("output", help="Destination .csv, .parquet or .arrow file")
+    parser.add_argument("--rows", default="10k", help="10k, 1m, 10m or a row count")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_superstore(generate_superstore(parse_size(args.rows), args.seed), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import datetime
+import functools
+import json
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Callable
+import numpy as np
+import pandas as pd
+import reflex as rx
+from reflex.state import State
+from app.data import jobs
+from app.data.cache import result_cache
+from app.data.cube import build_cube
+from app.data.indexes import build_indexes
+from app.data.rollups import build_rollup
+from app.data.ingest import compact_frame, normalize_superstore
+from app.data.store import SUPERSTORE_DATASET, dataset_store
+from app.state import DashboardState
+from benchmarks.generate import generate_superstore, parse_size
+
+# filtered_data is a plain property that the chat answers start from.
+VARS = ["filtered_data", *sorted(DashboardState.computed_vars)]
+# Jobs that the refresh events run on the aggregation pool.
+REFRESH_JOBS = {
+    "refresh_charts": lambda dashboard: jobs.chart_views(*dashboard._chart_request()),
+    "refresh_table": lambda dashboard: jobs.table_view(*dashboard._table_request()),
+}
+SCENARIOS = {
+    "all": {},
+    "category": {"selected_categories": ["Technology"]},
+    "region_date": {
+        "selected_regions": ["East", "West"],
+        "selected_date_range": {"start": "2015-03-10", "end": "2016-02-20"},
+    },
+    "search": {"search_query": "chairs", "sort_column": "Profit"},
+}
+EVENTS = {
+    "apply_category_filter": ("Technology",),
+    "apply_region_filter": ("West",),
+    "apply_date_preset": ("90d",),
+    "set_search_query": ("phones",),
+    "sort_table": ("Sales",),
+    "next_page": (),
+    "clear_filters": (),
+}
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _timed(fn: Callable) -> float:
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def _summary(samples: list[float]) -> dict[str, float]:
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def _session(overrides: dict) -> tuple[State, DashboardState]:
+    """Returns a fresh root state with a dashboard session attached to the dataset."""
+    root = State(_reflex_internal_init=True)
+    dashboard = root.get_substate(DashboardState.get_full_name().split(".")[1:])
+    dataset = dataset_store.get(SUPERSTORE_DATASET)
+    dashboard.dataset_id = dataset.dataset_id
+    dashboard.dataset_version = dataset.version
+    dashboard.is_loading = False
+    for name, value in overrides.items():
+        setattr(dashboard, name, value)
+    return root, dashboard
+
+
+def load_dataset(raw: pd.DataFrame) -> dict[str, float]:
+    """Publishes ``raw`` as the Superstore dataset, timing each load stage."""
+    timings = {}
+
+    def stage(name: str, fn: Callable, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        timings[f"{name}_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    frame = stage("normalize", normalize_superstore, raw)
+    frame, report = stage("compact", compact_frame, frame)
+    cube = stage("build_cube", build_cube, frame)
+    indexes = stage("build_indexes", build_indexes, frame)
+    rollup = stage("build_rollup", build_rollup, frame)
+    dataset_store.publish(
+        SUPERSTORE_DATASET,
+        frame,
+        cube=cube,
+        indexes=indexes,
+        compaction=report,
+        rollup=rollup,
+    )
+    return timings | {
+        "bytes_before": report.bytes_before,
+        "bytes_after": report.bytes_after,
+    }
+
+
+def _refresh(dashboard: DashboardState, events) -> None:
+    """Runs the jobs of the refresh events a handler returned and applies them."""
+    if not isinstance(events, list):
+        events = [events] if events is not None else []
+    for event in events:
+        dashboard._apply_results(REFRESH_JOBS[event.fn.__name__](dashboard))
+
+
+def bench_vars(repeat: int) -> dict[str, dict[str, dict]]:
+    """Times every var and refresh job of a new session, cold and warm.
+
+    Refresh jobs are reported under the name of their event.
+    """
+    targets = {var: (lambda d, var=var: getattr(d, var)) for var in VARS}
+    targets.update(REFRESH_JOBS)
+    results = {}
+    for scenario, overrides in SCENARIOS.items():
+        results[scenario] = {}
+        for name, target in targets.items():
+            cold, warm = [], []
+            for _ in range(repeat):
+                result_cache.clear()
+                _, dashboard = _session(overrides)
+                cold.append(_timed(lambda t=target, d=dashboard: t(d)))
+                _, dashboard = _session(overrides)
+                warm.append(_timed(lambda t=target, d=dashboard: t(d)))
+            results[scenario][name] = {"cold": _summary(cold), "warm": _summary(warm)}
+    return results
+
+
+def bench_events(repeat: int) -> dict[str, dict]:
+    """Times each event handler, the refresh jobs it starts and the delta it sends.
+
+    Sessions start with every view computed, as after the first render, and
+    the result cache is cleared so the filters an event applies are computed
+    anew. Refresh jobs run inline here rather than on the pool.
+    """
+    results = {}
+    for event, args in EVENTS.items():
+        handler = getattr(DashboardState, event).fn
+        handle, refresh, delta = [], [], []
+        for _ in range(repeat):
+            root, dashboard = _session({})
+            _refresh(
+                dashboard, [getattr(DashboardState, name) for name in REFRESH_JOBS]
+            )
+            root.get_delta()
+            root._clean()
+            result_cache.clear()
+            returned = []
+            call = functools.partial(handler, dashboard, *args)
+            handle.append(_timed(lambda c=call, r=returned: r.append(c())))
+            refresh.append(_timed(lambda r=returned, d=dashboard: _refresh(d, r[0])))
+            delta.append(_timed(root.get_delta))
+        results[event] = {
+            "handler": _summary(handle),
+            "refresh": _summary(refresh),
+            "delta": _summary(delta),
+            "total": _summary([sum(t) for t in zip(handle, refresh, delta)]),
+        }
+    return results
+
+
+def run(rows: int, repeat: int, seed: int) -> dict:
+    """Generates a table of ``rows`` order lines and benchmarks the dashboard on it."""
+    started = time.perf_counter()
+    raw = generate_superstore(rows, seed)
+    generate_ms = (time.perf_counter() - started) * 1000
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.datetime.now(datetime.UTC).isoformat(),
+            "rows": rows,
+            "seed": seed,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "reflex": rx.constants.Reflex.VERSION,
+            "generate_ms": round(generate_ms, 3),
+        },
+        "load": load_dataset(raw),
+        "vars": bench_vars(repeat),
+        "events": bench_events(repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard state.")
+    parser.add_argument("--rows", default="10k", help="10k, 1m, 10m or a row count")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--output", help="JSON file to write; prints to stdout if unset"
+    )
+    args = parser.parse_args()
+    results = run(parse_size(args.rows), args.repeat, args.seed)
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
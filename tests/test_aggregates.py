@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+from app.data import views
+from app.data.cube import build_cube, slice_cube
+from app.data.ingest import compact_frame, normalize_superstore
+from benchmarks.generate import generate_superstore
+
+# Date ranges with edges mid-month, on month ends and on a single day, with and
+# without category and region filters.
+CASES = [
+    ("", "", (), ()),
+    ("2016-03-15", "2016-09-10", ("Furniture",), ()),
+    ("2015-01-31", "2015-02-28", (), ("East", "West")),
+    ("2017-12-01", "2017-12-30", ("Office Supplies", "Technology"), ("Central",)),
+    ("2014-06-03", "2014-06-03", (), ()),
+]
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    frame, _ = compact_frame(normalize_superstore(generate_superstore(4000, seed=3)))
+    return frame
+
+
+def _rows(frame, start, end, categories=(), regions=()) -> pd.DataFrame:
+    # The plain pandas selection of the rows matching the filters.
+    if start and end:
+        dates = frame["Order Date"]
+        frame = frame[(dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))]
+    if categories:
+        frame = frame[frame["Category"].isin(categories)]
+    if regions:
+        frame = frame[frame["Region"].isin(regions)]
+    return frame
+
+
+def _totals(rows: pd.DataFrame) -> tuple[float, float, int]:
+    return (
+        float(rows["Sales"].sum()),
+        float(rows["Profit"].sum()),
+        rows["Order ID"].nunique(),
+    )
+
+
+@pytest.mark.parametrize("start,end,categories,regions", CASES)
+def test_cube_slice_matches_groupby(frame, start, end, categories, regions):
+    view = slice_cube(
+        build_cube(frame), _rows(frame, start, end), start, end, categories, regions
+    )
+    rows = _rows(frame, start, end, categories, regions)
+    sales, profit, orders = _totals(rows)
+    assert views.total_sales(view) == pytest.approx(sales)
+    assert views.total_profit(view) == pytest.approx(profit)
+    assert views.total_orders(view) == orders
+    monthly = rows.groupby("Order Month")
+    expected = pd.DataFrame(
+        {"Sales": monthly["Sales"].sum(), "Order ID": monthly["Order ID"].nunique()}
+    )
+    trend = views.sales_vs_profit_trend(view)
+    assert [record["Order ID"] for record in trend] == expected["Order ID"].tolist()
+    assert [record["Sales"] for record in trend] == pytest.approx(
+        expected["Sales"].tolist()
+    )
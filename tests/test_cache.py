@@ -0,0 +1,65 @@
+import pandas as pd
+from app.data.cache import ResultCache, estimate_size
+from app.data.store import DatasetStore
+
+
+def test_least_recently_used_entries_are_evicted_first():
+    cache = ResultCache(max_entries=2)
+    cache.put(("sales", 1, "a"), 1)
+    cache.put(("sales", 1, "b"), 2)
+    assert cache.get(("sales", 1, "a")) == 1
+    cache.put(("sales", 1, "c"), 3)
+    assert cache.get(("sales", 1, "b")) is None
+    assert cache.get(("sales", 1, "a")) == 1
+    assert cache.get(("sales", 1, "c")) == 3
+
+
+def test_size_limit_evicts_and_skips_oversized_values():
+    frame = pd.DataFrame({"Sales": range(1000)})
+    size = estimate_size(frame)
+    cache = ResultCache(max_bytes=size * 2)
+    cache.put(("sales", 1, "a"), frame)
+    cache.put(("sales", 1, "b"), frame)
+    cache.put(("sales", 1, "c"), frame)
+    assert len(cache) == 2
+    assert cache.size_bytes == size * 2
+    assert cache.get(("sales", 1, "a")) is None
+    cache.put(("sales", 1, "big"), pd.concat([frame] * 3))
+    assert cache.get(("sales", 1, "big")) is None
+    assert len(cache) == 2
+
+
+def test_get_or_compute_computes_once_per_key():
+    cache = ResultCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_compute(("sales", 1, "total"), compute) == 1
+    assert cache.get_or_compute(("sales", 1, "total"), compute) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_invalidate_keeps_one_version_of_one_dataset():
+    cache = ResultCache()
+    for key in [("sales", 1, "a"), ("sales", 2, "a"), ("other", 1, "a")]:
+        cache.put(key, "value")
+    cache.invalidate("sales", keep_version=2)
+    assert cache.get(("sales", 1, "a")) is None
+    assert cache.get(("sales", 2, "a")) == "value"
+    assert cache.get(("other", 1, "a")) == "value"
+    assert cache.size_bytes == 2 * estimate_size("value")
+
+
+def test_publishing_a_version_drops_the_previous_results(monkeypatch):
+    cache = ResultCache()
+    monkeypatch.setattr("app.data.store.result_cache", cache)
+    store = DatasetStore()
+    frame = pd.DataFrame({"Sales": [1.0]})
+    first = store.publish("sales", frame)
+    cache.put(("sales", first.version, "total"), 1.0)
+    second = store.publish("sales", frame)
+    assert second.version == first.version + 1
+    assert cache.get(("sales", first.version, "total")) is None
@@ -0,0 +1,34 @@
+import pandas as pd
+from app.data.comparison import kpi_changes, shift_dates
+
+
+def test_shift_dates_keeps_month_ends():
+    dates = pd.DatetimeIndex(["2016-03-31", "2016-03-30", "2016-02-29", "2016-01-15"])
+    assert shift_dates(dates, 1).strftime("%Y-%m-%d").tolist() == [
+        "2016-02-29",
+        "2016-02-29",
+        "2016-01-31",
+        "2015-12-15",
+    ]
+    assert shift_dates(dates, 12).strftime("%Y-%m-%d").tolist() == [
+        "2015-03-31",
+        "2015-03-30",
+        "2015-02-28",
+        "2015-01-15",
+    ]
+
+
+def test_kpi_changes_in_percent_and_margin_points():
+    current = {"total_sales": 1200.0, "total_profit": 240.0, "total_orders": 30}
+    prior = {"total_sales": 1000.0, "total_profit": 250.0, "total_orders": 0}
+    assert kpi_changes(current, prior) == {
+        "total_sales": 20.0,
+        "total_profit": -4.0,
+        "profit_margin": -5.0,
+    }
+
+
+def test_kpi_changes_against_a_loss_keep_their_sign():
+    current = {"total_sales": 100.0, "total_profit": -10.0, "total_orders": 2}
+    prior = {"total_sales": 0.0, "total_profit": -20.0, "total_orders": 1}
+    assert kpi_changes(current, prior) == {"total_profit": 50.0, "total_orders": 100.0}
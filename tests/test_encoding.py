@@ -0,0 +1,95 @@
+from app.data.encoding import decode_records, diff_columns, encode_records
+
+RECORDS = [
+    {"Order Date": "Jan 17", "Category": "Furniture", "Sales": 1200.456, "Orders": 3},
+    {"Order Date": "Feb 17", "Category": "Furniture", "Sales": 80.0, "Orders": 1},
+    {"Order Date": "Mar 17", "Category": "Technology", "Sales": 99.999, "Orders": 2},
+]
+
+
+def test_columnar_encoding_round_trips_rounded_records():
+    encoded = encode_records(RECORDS)
+    assert encoded["length"] == 3
+    assert encoded["labels"] == {"Category": ["Furniture", "Technology"]}
+    assert encoded["columns"]["Category"] == [0, 0, 1]
+    assert encoded["columns"]["Sales"] == [1200.46, 80, 100]
+    assert decode_records(encoded) == [
+        record | {"Sales": sales} for record, sales in zip(RECORDS, [1200.46, 80, 100])
+    ]
+
+
+def test_distinct_strings_and_missing_values_are_kept_as_is():
+    records = [{"Product": "A", "Profit": None}, {"Product": "B", "Profit": 1.5}]
+    encoded = encode_records(records)
+    assert encoded["labels"] == {}
+    assert encoded["columns"] == {"Product": ["A", "B"], "Profit": [None, 1.5]}
+    assert decode_records(encoded) == records
+
+
+def test_records_and_empty_charts_decode():
+    assert decode_records(RECORDS) is RECORDS
+    assert decode_records(encode_records([])) == []
+
+
+def _apply(chart: dict, patch: dict) -> dict:
+    # Applies a patch to the chart the browser holds, like chart_utils' decoder.
+    columns = {k: list(v) for k, v in chart["columns"].items()}
+    labels = dict(chart["labels"])
+    for name in patch["dropped"]:
+        columns.pop(name, None)
+        labels.pop(name, None)
+    for name, values in patch["columns"].items():
+        columns[name] = values
+        if name in patch["labels"]:
+            labels[name] = patch["labels"][name]
+        else:
+            labels.pop(name, None)
+    for name, points in patch["points"].items():
+        for row, value in points:
+            columns[name][row] = value
+    return {"length": patch["length"], "columns": columns, "labels": labels}
+
+
+def test_patches_rebuild_the_new_chart():
+    previous = encode_records(RECORDS)
+    changed = [
+        RECORDS[0] | {"Sales": 1300.0},
+        RECORDS[1],
+        RECORDS[2] | {"Category": "Office Supplies"},
+    ]
+    current = encode_records(changed)
+    patch = diff_columns(previous, current)
+    assert patch is not None
+    assert patch["points"] == {"Sales": [[0, 1300]]}
+    assert set(patch["columns"]) == {"Category"}
+    assert _apply(previous, patch) == current
+    assert decode_records(_apply(previous, patch)) == decode_records(current)
+
+
+def test_unchanged_charts_patch_to_nothing():
+    chart = encode_records(RECORDS)
+    patch = diff_columns(chart, encode_records(RECORDS))
+    assert (patch["columns"], patch["points"], patch["dropped"]) == ({}, {}, [])
+
+
+def test_dropped_columns_are_listed():
+    previous = encode_records(RECORDS)
+    current = encode_records(
+        [{k: v for k, v in record.items() if k != "Orders"} for record in RECORDS]
+    )
+    patch = diff_columns(previous, current)
+    assert patch["dropped"] == ["Orders"]
+    assert _apply(previous, patch) == current
+
+
+def test_resized_or_rewritten_charts_are_sent_whole():
+    previous = encode_records(RECORDS)
+    assert diff_columns(previous, encode_records(RECORDS[:2])) is None
+    rewritten = [
+        {
+            name: value * 2 if name in ("Sales", "Orders") else value + "!"
+            for name, value in record.items()
+        }
+        for record in RECORDS
+    ]
+    assert diff_columns(previous, encode_records(rewritten)) is None
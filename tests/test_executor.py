@@ -0,0 +1,125 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.data.jobs import JobCancelled, check_cancelled
+from app.executor import AggregationExecutor, ExecutorBusy
+
+
+def _wait_for(gate: threading.Event, value):
+    # Holds a worker until the gate opens.
+    if not gate.wait(5):
+        raise TimeoutError("gate never opened")
+    return value
+
+
+def test_jobs_beyond_the_queue_limit_are_rejected():
+    executor = AggregationExecutor(max_workers=4, max_pending=2, queue_timeout=0.1)
+    gate = threading.Event()
+
+    async def burst():
+        running = [
+            asyncio.ensure_future(executor.run(_wait_for, gate, i)) for i in range(2)
+        ]
+        await asyncio.sleep(0.05)
+        assert executor.pending == 2
+        with pytest.raises(ExecutorBusy):
+            await executor.run(_wait_for, gate, 2)
+        gate.set()
+        return await asyncio.gather(*running)
+
+    try:
+        assert asyncio.run(burst()) == [0, 1]
+        assert executor.pending == 0
+    finally:
+        executor.shutdown()
+
+
+def test_waiting_jobs_run_once_a_slot_frees():
+    executor = AggregationExecutor(max_workers=4, max_pending=1, queue_timeout=5)
+    gate = threading.Event()
+
+    async def queue():
+        first = asyncio.ensure_future(executor.run(_wait_for, gate, "first"))
+        second = asyncio.ensure_future(executor.run(_wait_for, gate, "second"))
+        await asyncio.sleep(0.05)
+        assert executor.pending == 1
+        assert not second.done()
+        gate.set()
+        return await asyncio.gather(first, second)
+
+    try:
+        assert asyncio.run(queue()) == ["first", "second"]
+    finally:
+        executor.shutdown()
+
+
+def _until_cancelled(started: threading.Event):
+    # Runs until the job is superseded or cancelled.
+    started.set()
+    while True:
+        check_cancelled()
+        time.sleep(0.005)
+
+
+def test_a_newer_job_with_the_same_key_stops_the_running_one():
+    executor = AggregationExecutor(max_workers=2)
+    started = threading.Event()
+
+    async def supersede():
+        first = asyncio.ensure_future(
+            executor.run(_until_cancelled, started, key="session")
+        )
+        await asyncio.to_thread(started.wait, 5)
+        second = await executor.run(len, "newer", key="session")
+        with pytest.raises(JobCancelled):
+            await first
+        return second
+
+    try:
+        assert asyncio.run(supersede()) == 5
+    finally:
+        executor.shutdown()
+
+
+def test_cancel_stops_the_latest_job_of_a_key():
+    executor = AggregationExecutor(max_workers=2)
+    started = threading.Event()
+
+    async def cancel():
+        job = asyncio.ensure_future(
+            executor.run(_until_cancelled, started, key="session")
+        )
+        await asyncio.to_thread(started.wait, 5)
+        executor.cancel("session")
+        with pytest.raises(JobCancelled):
+            await job
+
+    try:
+        asyncio.run(cancel())
+    finally:
+        executor.shutdown()
+
+
+def test_superseded_queued_jobs_never_run():
+    executor = AggregationExecutor(max_workers=2, max_pending=1, queue_timeout=5)
+    gate = threading.Event()
+    ran = []
+
+    async def queue():
+        blocking = asyncio.ensure_future(executor.run(_wait_for, gate, "blocking"))
+        await asyncio.sleep(0.05)
+        queued = asyncio.ensure_future(executor.run(ran.append, "old", key="session"))
+        await asyncio.sleep(0.01)
+        newer = asyncio.ensure_future(executor.run(ran.append, "new", key="session"))
+        await asyncio.sleep(0.01)
+        gate.set()
+        with pytest.raises(JobCancelled):
+            await queued
+        await asyncio.gather(blocking, newer)
+
+    try:
+        asyncio.run(queue())
+        assert ran == ["new"]
+    finally:
+        executor.shutdown()
@@ -0,0 +1,89 @@
+import gzip
+import io
+import pandas as pd
+import pytest
+from starlette.testclient import TestClient
+from app import settings
+from app.api import api
+from app.api_auth import sign_query
+from app.data.export import EXPORT_PATH, export_query, iter_csv, iter_gzip
+from app.data.filters import FilterSignature
+from app.data.indexes import build_indexes
+from app.data.ingest import DERIVED_COLUMNS, compact_frame, normalize_superstore
+from app.data.store import SUPERSTORE_DATASET, dataset_store
+from benchmarks.generate import generate_superstore
+
+SIGNATURE = FilterSignature(
+    start="2016-03-15T00:00:00",
+    end="2016-09-10T00:00:00",
+    categories=("Furniture", "Technology"),
+    regions=("West",),
+)
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    frame, _ = compact_frame(normalize_superstore(generate_superstore(2000, seed=5)))
+    dataset_store.publish(SUPERSTORE_DATASET, frame, indexes=build_indexes(frame))
+    return frame
+
+
+@pytest.fixture
+def client(frame) -> TestClient:
+    return TestClient(api)
+
+
+def _expected(frame: pd.DataFrame) -> pd.DataFrame:
+    dates = frame["Order Date"]
+    rows = frame[
+        (dates >= pd.Timestamp(SIGNATURE.start))
+        & (dates <= pd.Timestamp(SIGNATURE.end))
+        & frame["Category"].isin(SIGNATURE.categories)
+        & frame["Region"].isin(SIGNATURE.regions)
+    ]
+    return rows.drop(columns=DERIVED_COLUMNS)
+
+
+def test_iter_csv_batches_match_one_shot_csv(frame):
+    chunks = list(iter_csv(frame, batch_rows=300))
+    assert len(chunks) == -(-len(frame) // 300)
+    expected = frame.drop(columns=DERIVED_COLUMNS).to_csv(index=False).encode()
+    assert b"".join(chunks) == expected
+    assert gzip.decompress(b"".join(iter_gzip(iter(chunks)))) == expected
+
+
+def test_iter_csv_without_rows_writes_the_header(frame):
+    (chunk,) = iter_csv(frame.iloc[:0])
+    assert chunk.decode().rstrip("\n").split(",") == [
+        column for column in frame.columns if column not in DERIVED_COLUMNS
+    ]
+
+
+def test_signed_export_streams_the_filtered_rows(client, frame):
+    query = sign_query(export_query(SIGNATURE, compress=True))
+    response = client.get(f"{EXPORT_PATH}?{query}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    exported = pd.read_csv(io.BytesIO(gzip.decompress(response.content)))
+    assert len(exported) == len(_expected(frame)) > 0
+    assert exported["Order ID"].tolist() == _expected(frame)["Order ID"].tolist()
+
+
+@pytest.mark.parametrize("path", [EXPORT_PATH, "/heatmap"])
+def test_routes_reject_unsigned_tampered_and_expired_queries(client, path):
+    query = export_query(SIGNATURE)
+    assert client.get(f"{path}?{query}").status_code == 401
+    tampered = sign_query(query).replace("region=West", "region=East")
+    assert client.get(f"{path}?{tampered}").status_code == 401
+    expired = sign_query(query, lifetime=-1)
+    assert client.get(f"{path}?{expired}").status_code == 401
+    assert client.get(f"{path}?{sign_query(query)}").status_code == 200
+
+
+def test_routes_accept_the_api_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "API_TOKEN", "secret-token")
+    headers = {"Authorization": "Bearer secret-token"}
+    assert client.get(EXPORT_PATH, headers=headers).status_code == 200
+    assert client.get("/heatmap", headers=headers).status_code == 200
+    headers = {"Authorization": "Bearer wrong"}
+    assert client.get(EXPORT_PATH, headers=headers).status_code == 401
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data import views
+from app.data.filters import FilterSignature, selected_rows
+from app.data.indexes import SEARCH_COLUMNS, build_indexes
+from app.data.ingest import compact_frame, normalize_superstore
+from app.data.store import Dataset
+from benchmarks.generate import generate_superstore
+
+SIGNATURES = [
+    FilterSignature(),
+    FilterSignature(categories=("Furniture",), regions=("East", "West")),
+    FilterSignature(start="2015-02-14T00:00:00", end="2016-07-31T00:00:00"),
+    FilterSignature(
+        start="2016-01-01T00:00:00",
+        end="2017-06-30T00:00:00",
+        categories=("Technology", "Office Supplies"),
+        search="an",
+    ),
+    FilterSignature(search="chair"),
+    FilterSignature(search="no such product"),
+]
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    frame, _ = compact_frame(normalize_superstore(generate_superstore(3000, seed=7)))
+    return frame
+
+
+@pytest.fixture(scope="module")
+def dataset(frame) -> Dataset:
+    return Dataset("indexed", 1, frame, indexes=build_indexes(frame))
+
+
+def _matching(frame: pd.DataFrame, signature: FilterSignature) -> pd.DataFrame:
+    # The plain pandas rows of a signature, as filtered before the indexes.
+    mask = pd.Series(True, index=frame.index)
+    if signature.start and signature.end:
+        dates = frame["Order Date"]
+        mask &= (dates >= pd.Timestamp(signature.start)) & (
+            dates <= pd.Timestamp(signature.end)
+        )
+    if signature.categories:
+        mask &= frame["Category"].isin(signature.categories)
+    if signature.regions:
+        mask &= frame["Region"].isin(signature.regions)
+    if signature.search:
+        found = pd.Series(False, index=frame.index)
+        for column in SEARCH_COLUMNS:
+            text = frame[column].astype(str).str.lower()
+            found |= text.str.contains(signature.search, regex=False)
+        mask &= found
+    return frame[mask]
+
+
+@pytest.mark.parametrize("signature", SIGNATURES)
+def test_selected_rows_match_pandas_filters(dataset, frame, signature):
+    selected = selected_rows(dataset, signature)
+    expected = _matching(frame, signature).index.to_numpy()
+    if selected is None:
+        assert len(expected) == len(frame)
+    else:
+        assert np.array_equal(np.flatnonzero(selected), expected)
+
+
+def test_bitmaps_and_date_slice_match_masks(dataset, frame):
+    indexes = dataset.indexes
+    bits = indexes.select({"Category": ("Furniture",), "Region": ("South",)})
+    expected = frame["Category"].eq("Furniture") & frame["Region"].eq("South")
+    assert np.array_equal(indexes.rows(bits), np.flatnonzero(expected))
+    within = indexes.dates.slice(pd.Timestamp("2016-03-01"), pd.Timestamp("2016-03-31"))
+    in_march = frame["Order Date"].dt.strftime("%Y-%m") == "2016-03"
+    assert np.array_equal(np.arange(len(frame))[within], np.flatnonzero(in_march))
+
+
+@pytest.mark.parametrize("query", ["a", "ch", "table", "smith", "zzz"])
+def test_search_index_matches_substring_search(dataset, frame, query):
+    expected = _matching(frame, FilterSignature(search=query)).index.to_numpy()
+    assert np.array_equal(
+        np.flatnonzero(dataset.indexes.search.search(query)), expected
+    )
+
+
+@pytest.mark.parametrize("signature", SIGNATURES)
+@pytest.mark.parametrize(
+    "sort_column,sort_direction",
+    [("Order Date", "desc"), ("Sales", "asc"), ("Customer Name", "desc")],
+)
+def test_table_pages_match_pandas_sort(
+    dataset, frame, signature, sort_column, sort_direction
+):
+    expected = _matching(frame, signature).sort_values(
+        sort_column, ascending=sort_direction == "asc", kind="stable"
+    )
+    selected = selected_rows(dataset, signature)
+    pages = []
+    for page in range(1, 100):
+        result = views.table_page(
+            dataset, selected, sort_column, sort_direction, page, 250
+        )
+        assert result["total_filtered_rows"] == len(expected)
+        if not result["filtered_table_data"]:
+            break
+        pages += result["filtered_table_data"]
+    # Ties may be ordered differently; the sort keys and the rows must agree.
+    shown = pd.DataFrame(pages, columns=views.TABLE_COLUMNS)
+    expected_keys = expected[sort_column]
+    if sort_column == "Order Date":
+        expected_keys = expected_keys.dt.strftime("%Y-%m-%d")
+    identity = ["Order Date", "Product Name", "Customer Name"]
+    assert sorted(map(tuple, shown[identity].astype(str).values.tolist())) == sorted(
+        zip(
+            expected["Order Date"].dt.strftime("%Y-%m-%d"),
+            expected["Product Name"].astype(str),
+            expected["Customer Name"].astype(str),
+        )
+    )
+    assert (
+        shown[sort_column].tolist()
+        == expected_keys.astype(shown[sort_column].dtype).tolist()
+    )
+    unindexed = Dataset("unindexed", 1, frame)
+    fallback = views.table_page(
+        unindexed,
+        selected_rows(unindexed, signature),
+        sort_column,
+        sort_direction,
+        1,
+        250,
+    )
+    assert fallback["total_filtered_rows"] == len(expected)
+    assert [row[sort_column] for row in fallback["filtered_table_data"]] == (
+        shown[sort_column].tolist()[:250]
+    )
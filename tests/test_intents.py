@@ -0,0 +1,66 @@
+import pytest
+from app.chat import intents
+from app.data.cube import build_cube
+from app.data.filters import FilterSignature
+from app.data.ingest import compact_frame, normalize_superstore
+from app.data.store import dataset_store
+from benchmarks.generate import generate_superstore
+
+DATASET = "chat-test"
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    frame, _ = compact_frame(normalize_superstore(generate_superstore(1500, seed=9)))
+    return dataset_store.publish(DATASET, frame, cube=build_cube(frame))
+
+
+@pytest.mark.parametrize(
+    "query,name",
+    [
+        ("Show me sales vs profit", "sales_trend"),
+        ("What are the TOP SELLING PRODUCTS?", "top_products"),
+        ("Which region and category perform best?", "region_category"),
+        ("How does quantity relate to profit?", "quantity_profit"),
+        ("What is the order trend?", "order_volume"),
+        ("What's our profit margin?", "profit_margin"),
+        ("Which category performs best?", "category_performance"),
+    ],
+)
+def test_queries_route_to_their_intent(query, name):
+    assert intents.match_intent(query).name == name
+
+
+def test_unknown_queries_match_no_intent():
+    assert intents.match_intent("hello there") is None
+
+
+def test_answers_follow_the_filters_and_are_cached(dataset):
+    furniture = FilterSignature(categories=("Furniture",))
+    body = intents.answer(DATASET, dataset.version, furniture, "profit_margin")
+    rows = dataset.frame[dataset.frame["Category"] == "Furniture"]
+    margin = round(rows["Profit"].sum() / rows["Sales"].sum() * 100, 2)
+    assert f"**{margin:.2f}%**" in body
+    cached = intents.cached_answer(DATASET, dataset.version, furniture, "profit_margin")
+    assert cached == body
+    assert (
+        intents.cached_answer(
+            DATASET, dataset.version, FilterSignature(), "profit_margin"
+        )
+        is None
+    )
+
+
+def test_answers_without_data_are_empty(dataset):
+    nothing = FilterSignature(start="2030-01-01", end="2030-01-31")
+    assert intents.answer(DATASET, dataset.version, nothing, "sales_trend") == ""
+    assert intents.answer("missing", 1, nothing, "sales_trend") == ""
+
+
+def test_remembered_answers_are_served_from_the_cache(dataset):
+    signature = FilterSignature(regions=("West",))
+    intents.remember_answer(DATASET, dataset.version, signature, "top_products", "1.")
+    assert (
+        intents.cached_answer(DATASET, dataset.version, signature, "top_products")
+        == "1."
+    )
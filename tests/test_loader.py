@@ -0,0 +1,110 @@
+import asyncio
+import socket
+import pytest
+from app.data.loader import DatasetLoader, build_superstore, load_superstore
+from app.data.sources import CsvSource
+from app.data.store import DatasetStore
+from benchmarks.generate import generate_superstore, write_superstore
+
+
+class RemoteSource(CsvSource):
+    """A remote CSV whose downloads are served from memory and counted."""
+
+    def __init__(self, data: bytes):
+        super().__init__("https://example.invalid/superstore.csv")
+        self.data = data
+        self.reads = 0
+
+    def read_bytes(self) -> bytes:
+        self.reads += 1
+        if self.data is None:
+            raise OSError("network is unreachable")
+        return self.data
+
+
+@pytest.fixture(scope="module")
+def csv_bytes(tmp_path_factory) -> bytes:
+    path = tmp_path_factory.mktemp("source") / "superstore.csv"
+    write_superstore(generate_superstore(300, seed=1), str(path))
+    return path.read_bytes()
+
+
+def _loader(source, cache_dir, builds=None) -> DatasetLoader:
+    def build(data):
+        if builds is not None:
+            builds.append(data)
+        return build_superstore(source, cache_dir, data)
+
+    return DatasetLoader(
+        DatasetStore(),
+        "superstore",
+        build,
+        fetch=source.read_bytes,
+        checksum=source.checksum,
+    )
+
+
+def test_load_superstore_serves_cache_when_download_fails(csv_bytes, tmp_path):
+    source = RemoteSource(csv_bytes)
+    frame, _ = load_superstore(source, str(tmp_path))
+    source.data = None
+    cached, _ = load_superstore(source, str(tmp_path))
+    assert cached.equals(frame)
+
+
+def test_first_load_offline_serves_cache(csv_bytes, tmp_path):
+    source = RemoteSource(csv_bytes)
+    frame, _ = load_superstore(source, str(tmp_path))
+    source.data = None
+    dataset = asyncio.run(_loader(source, str(tmp_path)).get())
+    assert dataset.frame.equals(frame)
+
+
+def test_first_load_offline_without_cache_raises(tmp_path):
+    with pytest.raises(OSError):
+        asyncio.run(_loader(RemoteSource(None), str(tmp_path)).get())
+
+
+def test_concurrent_first_loads_share_one_download(csv_bytes, tmp_path):
+    source = RemoteSource(csv_bytes)
+    builds = []
+    loader = _loader(source, str(tmp_path), builds)
+
+    async def visits():
+        return await asyncio.gather(*(loader.get() for _ in range(5)))
+
+    datasets = asyncio.run(visits())
+    assert {dataset.version for dataset in datasets} == {1}
+    assert source.reads == 1
+    assert builds == [csv_bytes]
+
+
+def test_reload_keeps_unchanged_or_unreachable_source(csv_bytes, tmp_path):
+    source = RemoteSource(csv_bytes)
+    builds = []
+    loader = _loader(source, str(tmp_path), builds)
+
+    async def reloads():
+        first = await loader.get()
+        unchanged = await loader.refresh()
+        source.data = None
+        unreachable = await loader.refresh()
+        source.data = csv_bytes.replace(b"Second Class", b"Third Class")
+        changed = await loader.refresh()
+        return first, unchanged, unreachable, changed
+
+    first, unchanged, unreachable, changed = asyncio.run(reloads())
+    assert unchanged is first
+    assert unreachable is first
+    assert changed.version == 2
+    assert len(builds) == 2
+
+
+def test_stalled_download_times_out_to_cache(csv_bytes, tmp_path):
+    frame, _ = load_superstore(RemoteSource(csv_bytes), str(tmp_path))
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        # Accepts the connection but never answers the request.
+        port = server.getsockname()[1]
+        source = CsvSource(f"http://127.0.0.1:{port}/superstore.csv", timeout=0.2)
+        cached, _ = load_superstore(source, str(tmp_path))
+    assert cached.equals(frame)
@@ -0,0 +1,130 @@
+import pandas as pd
+import pytest
+from app.data.comparison import shift_dates
+from app.data.ingest import compact_frame, normalize_superstore
+from app.data.rollups import (
+    GRANULARITIES,
+    SPARKLINE_POINTS,
+    WEEK_DAYS,
+    build_rollup,
+    kpi_sparkline,
+    trend_charts,
+)
+from benchmarks.generate import generate_superstore
+
+# Date ranges with edges mid-month, on month ends and on a single day, with and
+# without category and region filters.
+CASES = [
+    ("", "", (), ()),
+    ("2016-03-15", "2016-09-10", ("Furniture",), ()),
+    ("2015-01-31", "2015-02-28", (), ("East", "West")),
+    ("2017-12-01", "2017-12-30", ("Office Supplies", "Technology"), ("Central",)),
+    ("2014-06-03", "2014-06-03", (), ()),
+]
+
+
+@pytest.fixture(scope="module")
+def frame() -> pd.DataFrame:
+    frame, _ = compact_frame(normalize_superstore(generate_superstore(4000, seed=3)))
+    return frame
+
+
+def _rows(frame, start, end, categories=(), regions=()) -> pd.DataFrame:
+    # The plain pandas selection of the rows matching the filters.
+    if start and end:
+        dates = frame["Order Date"]
+        frame = frame[(dates >= pd.Timestamp(start)) & (dates <= pd.Timestamp(end))]
+    if categories:
+        frame = frame[frame["Category"].isin(categories)]
+    if regions:
+        frame = frame[frame["Region"].isin(regions)]
+    return frame
+
+
+def _totals(rows: pd.DataFrame) -> tuple[float, float, int]:
+    return (
+        float(rows["Sales"].sum()),
+        float(rows["Profit"].sum()),
+        rows["Order ID"].nunique(),
+    )
+
+
+@pytest.mark.parametrize("start,end,categories,regions", CASES)
+def test_kpi_sparkline_matches_groupby(frame, start, end, categories, regions):
+    points = kpi_sparkline(build_rollup(frame), start, end, categories, regions)
+    first = pd.Timestamp(start) if start else frame["Order Date"].min()
+    last = pd.Timestamp(end) if end else frame["Order Date"].max()
+    days = (last - first).days + 1
+    period = WEEK_DAYS if days >= SPARKLINE_POINTS * WEEK_DAYS else 1
+    assert len(points) == min(SPARKLINE_POINTS, days // period)
+    for offset, point in enumerate(reversed(points)):
+        period_end = last - pd.Timedelta(days=offset * period)
+        period_start = period_end - pd.Timedelta(days=period - 1)
+        rows = _rows(frame, period_start, period_end, categories, regions)
+        sales, profit, orders = _totals(rows)
+        assert point["Period"] == period_end.strftime("%b %d")
+        assert point["Sales"] == pytest.approx(sales, abs=0.01)
+        assert point["Profit"] == pytest.approx(profit, abs=0.01)
+        assert point["Orders"] == orders
+
+
+@pytest.mark.parametrize(
+    "start,end,categories,granularity",
+    [
+        ("2016-02-10", "2016-03-20", ("Technology",), "day"),
+        ("2015-05-17", "2016-01-31", (), "week"),
+        ("2014-11-15", "2017-02-28", ("Furniture", "Office Supplies"), "month"),
+    ],
+)
+def test_trend_charts_match_groupby(frame, start, end, categories, granularity):
+    charts = trend_charts(build_rollup(frame), start, end, categories, (), months=12)
+    assert charts["trend_granularity"] == granularity
+    freq, label_format = GRANULARITIES[granularity]
+    rows = _rows(frame, start, end, categories)
+    buckets = rows.groupby(rows["Order Date"].dt.to_period(freq))
+    expected = pd.DataFrame(
+        {"Sales": buckets["Sales"].sum(), "Order ID": buckets["Order ID"].nunique()}
+    )
+    trend = charts["sales_vs_profit_trend"]
+    assert [record["Order Date"] for record in trend] == (
+        expected.index.strftime(label_format).tolist()
+    )
+    assert [record["Order ID"] for record in trend] == expected["Order ID"].tolist()
+    assert [record["Sales"] for record in trend] == pytest.approx(
+        expected["Sales"].tolist(), abs=0.01
+    )
+    # Each bucket, cut to the date range, compared with its days a year earlier.
+    first = expected.index.start_time.where(
+        expected.index.start_time > pd.Timestamp(start), pd.Timestamp(start)
+    )
+    last = expected.index.end_time.normalize()
+    last = last.where(last < pd.Timestamp(end), pd.Timestamp(end))
+    for record, prior_first, prior_last in zip(
+        trend, shift_dates(first, 12), shift_dates(last, 12)
+    ):
+        prior = _rows(frame, prior_first, prior_last, categories)
+        if prior.empty:
+            assert record["Prior Sales"] is None
+        else:
+            assert record["Prior Sales"] == pytest.approx(
+                prior["Sales"].sum(), abs=0.01
+            )
+            assert record["Prior Order ID"] == prior["Order ID"].nunique()
+
+
+@pytest.mark.parametrize("months", [12, 1])
+def test_kpi_windows_without_dates_compare_latest_months(frame, months):
+    windows = trend_charts(build_rollup(frame), "", "", (), ("South",), months)[
+        "kpi_windows"
+    ]
+    last = frame["Order Date"].max()
+    first = last - pd.DateOffset(months=months) + pd.Timedelta(days=1)
+    prior_first, prior_last = shift_dates(pd.DatetimeIndex([first, last]), months)
+    for window, (start, end) in [
+        ("current", (first, last)),
+        ("prior", (prior_first, prior_last)),
+    ]:
+        sales, profit, orders = _totals(_rows(frame, start, end, (), ("South",)))
+        assert windows[window]["total_sales"] == pytest.approx(sales)
+        assert windows[window]["total_profit"] == pytest.approx(profit)
+        assert windows[window]["total_orders"] == orders